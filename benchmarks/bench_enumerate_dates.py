@@ -0,0 +1,48 @@
+"""Scaling of `enumerate_dates` with the number of dates compared to the original linear scans.
+
+Run from the top of the repository with::
+
+    python benchmarks/bench_enumerate_dates.py
+"""
+
+import sys
+from pathlib import Path
+
+import pandas as pd
+from timing import timed
+
+from s1_frame_enumerator.date_enum import enumerate_dates
+
+
+# The reference implementation is shared with the tests
+sys.path.append(str(Path(__file__).resolve().parents[1] / 'tests'))
+from legacy_date_enum import legacy_enumerate_dates  # noqa: E402
+
+
+SIZES = [1_000, 2_000, 5_000, 20_000]
+# The original implementation is quadratic so is only timed up to this many dates
+MAX_LEGACY_SIZE = 2_000
+
+
+def make_dates(n_dates: int) -> list[pd.Timestamp]:
+    """Daily acquisitions (in reverse order) - far denser than any real stack but exercises the search."""
+    dates = pd.date_range('2015-01-01', periods=n_dates, freq='D', tz='UTC')
+    return dates[::-1].tolist()
+
+
+def main() -> None:
+    kwargs = dict(min_temporal_baseline_days=12, n_secondary_scenes_per_ref=3, n_init_seeds=3)
+    print(f'{"n_dates":>8} {"n_pairs":>8} {"enumerate (s)":>14} {"legacy (s)":>11} {"speedup":>8}')
+    for n in SIZES:
+        dates = make_dates(n)
+        t_new, pairs = timed(enumerate_dates, dates, **kwargs)
+        if n <= MAX_LEGACY_SIZE:
+            t_legacy, pairs_legacy = timed(legacy_enumerate_dates, dates, **kwargs)
+            assert pairs == pairs_legacy
+            print(f'{n:>8} {len(pairs):>8} {t_new:>14.3f} {t_legacy:>11.3f} {t_legacy / t_new:>7.1f}x')
+        else:
+            print(f'{n:>8} {len(pairs):>8} {t_new:>14.3f} {"-":>11} {"-":>8}')
+
+
+if __name__ == '__main__':
+    main()
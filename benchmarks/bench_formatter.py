@@ -0,0 +1,61 @@
+"""Scaling of `format_results_for_sent1_stack` and its repeat pass grouping on synthetic ASF results.
+
+Run from the top of the repository with::
+
+    python benchmarks/bench_formatter.py
+"""
+
+import pandas as pd
+from synthetic import make_asf_results
+from timing import timed
+
+from s1_frame_enumerator.s1_stack_formatter import (
+    REPEAT_PASS_BIN,
+    format_results_for_sent1_stack,
+    get_repeat_pass_timestamps,
+)
+
+
+SIZES = [10_000, 50_000, 100_000]
+
+
+def legacy_repeat_pass_grouping(df_formatted: pd.DataFrame) -> pd.DataFrame:
+    """Per-row repeat pass grouping of the formatter prior to vectorization (for comparison only)."""
+    df_formatted = df_formatted.copy()
+    julian_dates = df_formatted.start_time.map(lambda dt: dt.to_julian_date())
+    df_formatted['stack_repeat_pass_id'] = ((julian_dates - julian_dates[0]) // 5).astype(int)
+    df_formatted['stack_repeat_pass_id'] = df_formatted.groupby(['stack_repeat_pass_id']).ngroup()
+    df_temp = pd.DataFrame(columns=['stack_repeat_pass_id', 'repeat_pass_timestamp'])
+    df_temp['stack_repeat_pass_id'] = df_formatted.stack_repeat_pass_id
+    df_temp['repeat_pass_timestamp'] = pd.to_datetime(df_formatted.start_time.dt.date)
+    df_temp.repeat_pass_timestamp = df_temp.repeat_pass_timestamp.map(lambda ts: ts.tz_localize('UTC'))
+    df_repeat_pass_timestamp = df_temp.groupby('stack_repeat_pass_id').min()
+    repeat_pass_dict = df_repeat_pass_timestamp.to_dict()['repeat_pass_timestamp']
+    df_formatted['repeat_pass_timestamp'] = df_formatted.stack_repeat_pass_id.map(lambda rp_id: repeat_pass_dict[rp_id])
+    return df_formatted
+
+
+def repeat_pass_grouping(df_formatted: pd.DataFrame) -> pd.DataFrame:
+    """Repeat pass grouping as currently done in `format_results_for_sent1_stack`."""
+    df_formatted = df_formatted.copy()
+    pass_bin = (df_formatted.start_time - df_formatted.start_time.iloc[0]) // REPEAT_PASS_BIN
+    df_formatted['stack_repeat_pass_id'] = pass_bin.groupby(pass_bin).ngroup()
+    df_formatted['repeat_pass_timestamp'] = get_repeat_pass_timestamps(
+        df_formatted.start_time, df_formatted.stack_repeat_pass_id
+    )
+    return df_formatted
+
+
+def main() -> None:
+    print(f'{"n_slcs":>8} {"format (s)":>11} {"legacy grouping (s)":>20} {"grouping speedup":>17}')
+    for n in SIZES:
+        results = make_asf_results(n)
+        t_format, df = timed(format_results_for_sent1_stack, results)
+        t_legacy, df_legacy = timed(legacy_repeat_pass_grouping, df)
+        assert df_legacy.equals(df)
+        t_grouping, _ = timed(repeat_pass_grouping, df)
+        print(f'{n:>8} {t_format:>11.3f} {t_legacy:>20.3f} {t_legacy / t_grouping:>16.1f}x')
+
+
+if __name__ == '__main__':
+    main()
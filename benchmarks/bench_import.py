@@ -0,0 +1,43 @@
+"""Cold import times of the package and its public API measured in fresh interpreters.
+
+Run from the top of the repository with::
+
+    python benchmarks/bench_import.py
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+
+
+STATEMENTS = {
+    'package': 'import s1_frame_enumerator',
+    'enumerate_dates': 'from s1_frame_enumerator import enumerate_dates',
+    'S1Frame': 'from s1_frame_enumerator import S1Frame',
+    'get_s1_stack': 'from s1_frame_enumerator import get_s1_stack',
+    'full_api': 'from s1_frame_enumerator import *',
+}
+
+
+def time_import(statement: str, repeat: int = 5) -> float:
+    """Median wall time (in seconds) of running `statement` in a fresh interpreter minus interpreter startup."""
+
+    def run(code: str) -> float:
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        return time.perf_counter() - start
+
+    # Warm the filesystem cache before measuring
+    run(statement)
+    baseline = statistics.median(run('pass') for _ in range(repeat))
+    return statistics.median(run(statement) for _ in range(repeat)) - baseline
+
+
+def main() -> None:
+    for name, statement in STATEMENTS.items():
+        print(f'{name:>20}: {time_import(statement) * 1_000:8.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,43 @@
+"""Memory of formatted stacks with the default and compact dtypes (see `compact_stack_dtypes`).
+
+Run from the top of the repository with::
+
+    python benchmarks/bench_stack_memory.py
+"""
+
+import pandas as pd
+from synthetic import make_asf_results
+
+from s1_frame_enumerator.s1_stack_formatter import compact_stack_dtypes, format_results_for_sent1_stack
+
+
+SIZES = [10_000, 100_000]
+STRING_COLUMNS = ['slc_id', 'url', 'polarization', 'beam_mode', 'flight_direction']
+
+
+def memory_mb(df: pd.DataFrame) -> pd.Series:
+    """Memory (MB) of each column including the python objects it references (geometries are not counted)."""
+    return df.drop(columns='geometry').memory_usage(deep=True, index=False) / 1e6
+
+
+def main() -> None:
+    for n in SIZES:
+        df_stack = format_results_for_sent1_stack(make_asf_results(n))
+        # Strings are python objects by default prior to pandas 3
+        df_stack_objects = df_stack.astype({column: object for column in STRING_COLUMNS})
+        mem = pd.DataFrame(
+            {
+                'object strings (MB)': memory_mb(df_stack_objects),
+                'default (MB)': memory_mb(df_stack),
+                'compact (MB)': memory_mb(compact_stack_dtypes(df_stack, string_dtype=False)),
+                'compact + string (MB)': memory_mb(compact_stack_dtypes(df_stack)),
+            }
+        )
+        mem.loc['total'] = mem.sum()
+        print(f'{n} SLCs (pandas {pd.__version__})')
+        print(mem.round(2).to_string())
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""Wall time and peak memory of each stage of the frame -> stack -> interferogram pipeline.
+
+The stages are timed on the bundled test fixtures and on synthetic stacks (see `synthetic.py`) of 10k to 200k SLCs.
+Benchmarks of the frame catalogs are skipped if the catalogs are not available. Run from the top of the repository
+with::
+
+    python benchmarks/run_benchmarks.py --save-baseline
+
+to record a baseline (by default `benchmarks/baseline.json`) and then after a change::
+
+    python benchmarks/run_benchmarks.py
+
+to compare against it; benchmarks slower (or using more memory) than the baseline by more than `--threshold` are
+reported as regressions and the script exits with a non-zero status. Use `--quick` for smaller synthetic stacks and
+`--filter` to run a subset of the benchmarks (by substring of their names).
+
+Baselines are not kept in the repository (`benchmarks/baseline.json` is ignored by git) since timings only compare
+well on the same machine. Record one before a change, with the frame catalogs present so the catalog benchmarks are
+included, and compare after it on the same machine; the `environment` of the baseline records where it was measured
+and a warning is printed when comparing from a different environment. To share numbers (e.g. in a pull request), save
+them with `--output` and quote the machine (CPU model and count, OS, python and library versions) along with them.
+
+Wall time is the minimum over `--repeat` runs. Peak memory is measured with `tracemalloc` in a separate run so it
+does not affect the timings; it counts the allocations made through python (numpy, pandas and pyarrow buffers
+included) but not the memory allocated by GEOS for geometries.
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tracemalloc
+import warnings
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import geopandas as gpd
+import pandas as pd
+from synthetic import make_asf_results, make_frames
+from timing import timed
+
+from s1_frame_enumerator import __version__, enumerate_dates, enumerate_gunw_time_series, s1_frames
+from s1_frame_enumerator.s1_stack import (
+    filter_s1_stack_by_geometric_coverage_per_frame,
+    filter_s1_stack_by_geometric_coverage_per_pass,
+)
+from s1_frame_enumerator.s1_stack_formatter import format_results_for_sent1_stack
+
+
+DATA_DIR = Path(__file__).resolve().parents[1] / 'tests' / 'data'
+DEFAULT_BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+SYNTHETIC_SIZES = [10_000, 50_000, 200_000]
+QUICK_SYNTHETIC_SIZES = [10_000, 20_000]
+# Enumeration selects SLCs for every pair of dates and frame so it is only run on the smallest synthetic stack
+N_ENUMERATION_FRAMES = 3
+N_DATES = [1_000, 5_000]
+# Benchmarks under this many seconds are repeated and the minimum is reported
+MIN_REPEATED_SECONDS = 5.0
+REGRESSION_THRESHOLD = 1.25
+
+
+@dataclass
+class Benchmark:
+    name: str
+    func: Callable[[], Any]
+
+
+def nz_stack() -> gpd.GeoDataFrame:
+    return gpd.read_parquet(DATA_DIR / 'stack__New-Zealand_track_146.parquet')
+
+
+def fixture_benchmarks() -> Iterator[Benchmark]:
+    for path in sorted(DATA_DIR.glob('frame_*_asf_results.json')):
+        results = json.loads(path.read_text())
+        yield Benchmark(f'format/{path.stem}', lambda results=results: format_results_for_sent1_stack(results))
+
+    df_nz = nz_stack()
+    yield Benchmark(
+        'enumerate_gunw_time_series/nz_track_146', lambda: enumerate_gunw_time_series(df_nz, show_progress=False)
+    )
+
+
+def catalog_benchmarks() -> Iterator[Benchmark]:
+    if not s1_frames.FRAMES_PATH.exists():
+        print(f'Skipping catalog benchmarks: {s1_frames.FRAMES_PATH} not found', file=sys.stderr)
+        return
+
+    def load_catalog() -> gpd.GeoDataFrame:
+        s1_frames.get_global_s1_frames.cache_clear()
+        s1_frames.get_global_s1_frames_tree.cache_clear()
+        return s1_frames.get_global_s1_frames()
+
+    yield Benchmark('catalog/load', load_catalog)
+
+    aoi = nz_stack().geometry.union_all()
+    yield Benchmark('catalog/get_overlapping_s1_frames', lambda: s1_frames.get_overlapping_s1_frames(aoi, [146]))
+
+
+def synthetic_benchmarks(sizes: list[int]) -> Iterator[Benchmark]:
+    for n in sizes:
+        results = make_asf_results(n)
+        yield Benchmark(f'format/synthetic_{n}', lambda results=results: format_results_for_sent1_stack(results))
+
+        df_stack = format_results_for_sent1_stack(results)
+        frames = make_frames(n)
+        yield Benchmark(
+            f'filter_per_pass/synthetic_{n}',
+            lambda df_stack=df_stack, frames=frames: filter_s1_stack_by_geometric_coverage_per_pass(df_stack, frames),
+        )
+        yield Benchmark(
+            f'filter_per_frame/synthetic_{n}',
+            lambda df_stack=df_stack, frames=frames: filter_s1_stack_by_geometric_coverage_per_frame(df_stack, frames),
+        )
+
+    n = sizes[0]
+    frames = make_frames(n)[:N_ENUMERATION_FRAMES]
+    # As in `get_s1_stack`, passes not covering the frames (e.g. the last partial pass) are removed
+    df_stack = format_results_for_sent1_stack(make_asf_results(n))
+    df_stack = filter_s1_stack_by_geometric_coverage_per_frame(df_stack, frames)
+    yield Benchmark(
+        f'enumerate_gunw_time_series/synthetic_{n}', lambda: enumerate_gunw_time_series(df_stack, show_progress=False)
+    )
+    yield Benchmark(
+        f'enumerate_gunw_time_series/synthetic_{n}_{len(frames)}_frames',
+        lambda: enumerate_gunw_time_series(df_stack, frames=frames, show_progress=False),
+    )
+
+    for n_dates in N_DATES:
+        dates = pd.date_range('2015-01-01', periods=n_dates, freq='6D', tz='UTC').tolist()
+        yield Benchmark(
+            f'enumerate_dates/{n_dates}',
+            lambda dates=dates: enumerate_dates(dates, 0, n_secondary_scenes_per_ref=3, n_init_seeds=3),
+        )
+
+
+def measure(benchmark: Benchmark, repeat: int, memory: bool) -> dict:
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        elapsed, _ = timed(benchmark.func)
+        times.append(elapsed)
+        if times[-1] > MIN_REPEATED_SECONDS:
+            break
+
+    result = {'time_s': min(times)}
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            benchmark.func()
+            result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 1e6
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def environment() -> dict:
+    return {
+        's1_frame_enumerator': __version__,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'geopandas': gpd.__version__,
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'platform': platform.platform(),
+    }
+
+
+def comparable_environment(env: dict) -> dict:
+    """Environment without the package version (which changes with every commit)."""
+    return {k: v for k, v in env.items() if k != 's1_frame_enumerator'}
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Benchmarks of `results` slower or using more memory than in `baseline` by more than a factor `threshold`."""
+    regressions = []
+    print(f'\n{"benchmark":<55} {"time":>8} {"baseline":>9} {"ratio":>6} {"peak MB":>8} {"baseline":>9} {"ratio":>6}')
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f'{name:<55} {result["time_s"]:>8.3f} {"-":>9}')
+            continue
+        row = f'{name:<55}'
+        for metric, fmt in [('time_s', '.3f'), ('peak_mb', '.1f')]:
+            if metric not in result or metric not in base:
+                row += f' {"-":>8} {"-":>9} {"-":>6}'
+                continue
+            ratio = result[metric] / base[metric] if base[metric] else float('inf')
+            flag = '!' if ratio > threshold else ' '
+            row += f' {result[metric]:>8{fmt}} {base[metric]:>9{fmt}} {ratio:>5.2f}{flag}'
+            if ratio > threshold:
+                regressions.append(f'{name} {metric}: {result[metric]:{fmt}} vs {base[metric]:{fmt}} ({ratio:.2f}x)')
+        print(row)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', type=Path, default=DEFAULT_BASELINE_PATH, help='baseline results (JSON)')
+    parser.add_argument('--save-baseline', action='store_true', help='write the results to the baseline')
+    parser.add_argument('--output', type=Path, help='also write the results to this file (JSON)')
+    parser.add_argument('--quick', action='store_true', help=f'synthetic stacks of {QUICK_SYNTHETIC_SIZES} SLCs')
+    parser.add_argument('--filter', default='', help='only run the benchmarks whose name contains this string')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark (the minimum time is reported)')
+    parser.add_argument('--no-memory', action='store_true', help='skip the (slower) peak memory measurements')
+    parser.add_argument('--threshold', type=float, default=REGRESSION_THRESHOLD, help='regression ratio')
+    args = parser.parse_args()
+
+    sizes = QUICK_SYNTHETIC_SIZES if args.quick else SYNTHETIC_SIZES
+    results = {}
+    with warnings.catch_warnings():
+        # The coverage filters warn about the passes they remove
+        warnings.simplefilter('ignore')
+        benchmarks = [*catalog_benchmarks(), *fixture_benchmarks(), *synthetic_benchmarks(sizes)]
+        for benchmark in benchmarks:
+            if args.filter not in benchmark.name:
+                continue
+            results[benchmark.name] = measure(benchmark, args.repeat, memory=not args.no_memory)
+            peak = results[benchmark.name].get('peak_mb')
+            peak_str = f'{peak:>10.1f} MB' if peak is not None else ''
+            print(f'{benchmark.name:<55} {results[benchmark.name]["time_s"]:>8.3f} s{peak_str}', file=sys.stderr)
+
+    output = {'environment': environment(), 'results': results}
+    if args.output:
+        args.output.write_text(json.dumps(output, indent=2))
+    if args.save_baseline:
+        if not s1_frames.FRAMES_PATH.exists():
+            print('Warning: the baseline does not include the catalog benchmarks (frame catalogs not found)')
+        args.baseline.write_text(json.dumps(output, indent=2))
+        print(f'Saved baseline to {args.baseline}')
+        return
+    if not args.baseline.exists():
+        print(f'No baseline at {args.baseline}; run with --save-baseline to record one')
+        return
+
+    baseline = json.loads(args.baseline.read_text())
+    if comparable_environment(baseline['environment']) != comparable_environment(output['environment']):
+        print(f'Warning: the baseline was recorded in a different environment: {baseline["environment"]}')
+    regressions = compare(results, baseline['results'], args.threshold)
+    if regressions:
+        print('\nRegressions:\n' + '\n'.join(regressions))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Synthetic ASF search results and stacks for benchmarking at scale."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+from shapely.geometry import box, mapping
+
+
+MAX_PASSES = 1_200  # ~20 years of 6 day repeats
+
+
+def make_asf_results(
+    n_slcs: int,
+    n_slcs_per_pass: int | None = None,
+    track_number: int = 64,
+    start_time: str = '2015-01-01T01:48:50Z',
+    lon_min: float = -119.0,
+    lat_min: float = -70.0,
+    seed: int = 0,
+) -> list[dict]:
+    """ASF geojson results of `n_slcs` SLCs along one track acquired every 6 days.
+
+    Each pass consists of `n_slcs_per_pass` overlapping SLCs stacked in latitude (by default 3 or as many as
+    needed to keep the time series under ~20 years); passes are jittered by a few seconds and a few hundredths of a
+    degree.
+    """
+    if n_slcs_per_pass is None:
+        n_slcs_per_pass = max(3, -(-n_slcs // MAX_PASSES))
+    lat_step = min(1.5, (70 - lat_min) / n_slcs_per_pass)
+    rng = np.random.default_rng(seed)
+    t0 = pd.Timestamp(start_time)
+    results = []
+    for k in range(n_slcs):
+        n_pass, n_along_track = divmod(k, n_slcs_per_pass)
+        jitter_s = float(rng.uniform(-5, 5))
+        slc_start = t0 + pd.Timedelta(days=6 * n_pass, seconds=25 * n_along_track + jitter_s)
+        slc_stop = slc_start + pd.Timedelta(seconds=27)
+        platform = 'S1A' if n_pass % 2 == 0 else 'S1B'
+        start_str = slc_start.strftime('%Y%m%dT%H%M%S')
+        stop_str = slc_stop.strftime('%Y%m%dT%H%M%S')
+        slc_id = f'{platform}_IW_SLC__1SDV_{start_str}_{stop_str}_{n_pass:06d}_{k % 65536:06X}_{k % 65536:04X}'
+        dx, dy = rng.uniform(-0.02, 0.02, size=2)
+        y0 = lat_min + lat_step * n_along_track + dy
+        geometry = box(lon_min + dx, y0, lon_min + 2.5 + dx, y0 + 1.7)
+        results.append(
+            {
+                'type': 'Feature',
+                'geometry': mapping(geometry),
+                'properties': {
+                    'fileID': f'{slc_id}-SLC',
+                    'startTime': slc_start.isoformat().replace('+00:00', 'Z'),
+                    'stopTime': slc_stop.isoformat().replace('+00:00', 'Z'),
+                    'url': f'https://datapool.asf.alaska.edu/SLC/S{platform[-1]}/{slc_id}.zip',
+                    'pathNumber': track_number,
+                    'orbit': 1_000 + n_pass,
+                    'polarization': 'VV+VH',
+                    'beamModeType': 'IW',
+                    'bytes': 4_500_000_000,
+                    'flightDirection': 'ASCENDING',
+                },
+            }
+        )
+    return results
+
+
+def make_frames(
+    n_slcs: int,
+    n_slcs_per_pass: int | None = None,
+    track_number: int = 64,
+    lon_min: float = -119.0,
+    lat_min: float = -70.0,
+) -> list[SimpleNamespace]:
+    """Stand-ins for the S1Frames covered by the passes of `make_asf_results` with the same arguments.
+
+    There is one frame per SLC along track (slightly inside its nominal footprint) exposing the attributes used by
+    the stack filters and enumeration so that benchmarks do not require the frame catalogs.
+    """
+    if n_slcs_per_pass is None:
+        n_slcs_per_pass = max(3, -(-n_slcs // MAX_PASSES))
+    lat_step = min(1.5, (70 - lat_min) / n_slcs_per_pass)
+    frames = []
+    for k in range(n_slcs_per_pass):
+        y0 = lat_min + lat_step * k
+        geometry = box(lon_min + 0.1, y0 + 0.1, lon_min + 2.4, y0 + 1.6)
+        frames.append(
+            SimpleNamespace(
+                frame_id=k,
+                hemisphere=None,
+                track_numbers=[track_number],
+                frame_geometry=geometry,
+                footprint_geometry=geometry,
+            )
+        )
+    return frames
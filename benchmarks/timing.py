@@ -0,0 +1,12 @@
+"""Timing helper shared by the benchmarks."""
+
+import time
+from collections.abc import Callable
+from typing import Any
+
+
+def timed(func: Callable, *args: Any, **kwargs: Any) -> tuple[float, Any]:  # noqa: ANN401
+    """Wall time (s) of `func(*args, **kwargs)` and its output."""
+    start = time.perf_counter()
+    out = func(*args, **kwargs)
+    return time.perf_counter() - start, out
@@ -1,22 +1,33 @@
+import importlib
 import warnings
 from importlib.metadata import PackageNotFoundError, version
+from typing import TYPE_CHECKING, Any
 
-from .ifg_enum import enumerate_dates, enumerate_gunw_time_series
-from .s1_frames import (
-    S1Frame,
-    frames2gdf,
-    gdf2frames,
-    get_global_gunw_footprints,
-    get_global_s1_frames,
-    get_overlapping_s1_frames,
-)
-from .s1_stack import (
-    MIN_S1C_DATE,
-    filter_s1_stack_by_geometric_coverage_per_pass,
-    get_s1_stack,
-    query_slc_metadata_over_frame,
-)
-from .s1_stack_formatter import format_results_for_sent1_stack
+
+if TYPE_CHECKING:
+    from .date_enum import enumerate_dates
+    from .ifg_enum import enumerate_gunw_time_series, ifgs2gdf, iter_gunw_time_series
+    from .instrumentation import StageRecord, StageStats
+    from .pass_footprints import PassFootprints
+    from .query_cache import QueryCache
+    from .s1_frames import (
+        S1Frame,
+        frames2gdf,
+        gdf2frames,
+        get_global_gunw_footprints,
+        get_global_s1_frames,
+        get_overlapping_s1_frames,
+        get_overlapping_s1_frames_batch,
+    )
+    from .s1_stack import (
+        MIN_S1C_DATE,
+        filter_s1_stack_by_geometric_coverage_per_pass,
+        get_s1_stack,
+        query_slc_metadata_over_frame,
+    )
+    from .s1_stack_async import aget_s1_stack, aquery_slc_metadata_over_frame
+    from .s1_stack_formatter import format_results_for_sent1_stack
+    from .slc_catalog import LocalSLCCatalog, harvest_slc_metadata
 
 
 try:
@@ -30,7 +41,52 @@ except PackageNotFoundError:
         RuntimeWarning,
     )
 
+# The public API is resolved lazily (PEP 562) so that importing the package does not pull in
+# geopandas, asf_search, etc. until an attribute requiring them is accessed.
+_LAZY_ATTRIBUTES = {
+    'aget_s1_stack': '.s1_stack_async',
+    'aquery_slc_metadata_over_frame': '.s1_stack_async',
+    'enumerate_dates': '.date_enum',
+    'enumerate_gunw_time_series': '.ifg_enum',
+    'filter_s1_stack_by_geometric_coverage_per_pass': '.s1_stack',
+    'format_results_for_sent1_stack': '.s1_stack_formatter',
+    'frames2gdf': '.s1_frames',
+    'gdf2frames': '.s1_frames',
+    'get_global_gunw_footprints': '.s1_frames',
+    'get_global_s1_frames': '.s1_frames',
+    'get_overlapping_s1_frames': '.s1_frames',
+    'get_overlapping_s1_frames_batch': '.s1_frames',
+    'get_s1_stack': '.s1_stack',
+    'harvest_slc_metadata': '.slc_catalog',
+    'ifgs2gdf': '.ifg_enum',
+    'iter_gunw_time_series': '.ifg_enum',
+    'LocalSLCCatalog': '.slc_catalog',
+    'PassFootprints': '.pass_footprints',
+    'QueryCache': '.query_cache',
+    'query_slc_metadata_over_frame': '.s1_stack',
+    'S1Frame': '.s1_frames',
+    'StageRecord': '.instrumentation',
+    'StageStats': '.instrumentation',
+    'MIN_S1C_DATE': '.s1_stack',
+}
+
+
+def __getattr__(name: str) -> Any:  # noqa: ANN401
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 __all__ = [
+    'aget_s1_stack',
+    'aquery_slc_metadata_over_frame',
     'enumerate_dates',
     'enumerate_gunw_time_series',
     'filter_s1_stack_by_geometric_coverage_per_pass',
@@ -40,8 +96,17 @@ __all__ = [
     'get_global_gunw_footprints',
     'get_global_s1_frames',
     'get_overlapping_s1_frames',
+    'get_overlapping_s1_frames_batch',
     'get_s1_stack',
+    'harvest_slc_metadata',
+    'ifgs2gdf',
+    'iter_gunw_time_series',
+    'LocalSLCCatalog',
+    'PassFootprints',
+    'QueryCache',
     'query_slc_metadata_over_frame',
     'S1Frame',
+    'StageRecord',
+    'StageStats',
     'MIN_S1C_DATE',
 ]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import datetime
+from bisect import bisect_right
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING
+
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def viable_secondary_date(
+    secondary_date: datetime.datetime | pd.Timestamp,
+    reference_date: datetime.datetime | pd.Timestamp,
+    min_temporal_baseline_days: int,
+) -> bool:
+    timedelta = datetime.timedelta(days=min_temporal_baseline_days)
+    cond_1 = secondary_date <= reference_date - timedelta
+    cond_2 = secondary_date != reference_date
+    return cond_1 and cond_2
+
+
+def enumerate_dates(
+    dates: list[pd.Timestamp],
+    min_temporal_baseline_days: int,
+    n_secondary_scenes_per_ref: int = 3,
+    n_init_seeds: int = 1,
+) -> list[tuple]:
+    """Enumerate date pairs.
+
+    Parameters
+    ----------
+    dates : List[datetime.date]
+        List of dates for enumeration (can be unsorted). Should have timezone otherwise comparisons will be invalid.
+    min_temporal_baseline_days : int
+        Ensures ifg pairs must have at least this many days between them
+    n_secondary_scenes_per_ref : int, optional
+        When creating time series, selects at most 3 viable dates to include in subsequent pairs, by default 3
+    n_init_seeds : int, optional
+        How many initial dates to populate the queue with; most recent dates are seeds, by default 1. Must be >= 1.
+
+    Returns
+    -------
+    List[tuple]
+        (reference_date, secondary_date)
+    """
+    sorted_dates = sorted(dates, reverse=True)
+    # Ascending copy so the viable secondary dates (see `viable_secondary_date`) of a reference date are found by
+    # bisection: they are the dates up to `ref_date - min_temporal_baseline` other than `ref_date` itself
+    ascending_dates = sorted_dates[::-1]
+    timedelta = datetime.timedelta(days=min_temporal_baseline_days)
+    queue = deque(sorted_dates[:n_init_seeds])
+    dates_visited = {sorted_dates[0]}
+    pairs = []
+
+    neighbors = n_secondary_scenes_per_ref
+    while queue:
+        ref_date = queue.popleft()
+        n_viable = bisect_right(ascending_dates, ref_date - timedelta)
+        # Most recent viable dates first
+        available_dates = (
+            date for date in map(ascending_dates.__getitem__, range(n_viable - 1, -1, -1)) if date != ref_date
+        )
+        if neighbors >= 0:
+            secondary_dates = list(islice(available_dates, neighbors))
+        else:
+            secondary_dates = list(available_dates)[:neighbors]
+        pairs += [(ref_date, sec_date) for sec_date in secondary_dates]
+        for sec_date in secondary_dates:
+            if sec_date not in dates_visited:
+                dates_visited.add(sec_date)
+                queue.append(sec_date)
+
+    # Have to de-duplicate pairs (i.e. ensure uniqueness of items) due to seeds.
+    # There are situations when a visited date may be removed from the queue
+    # And then added back with multiple initial date seeds.
+    pairs = list(set(pairs))
+    return sorted(pairs, reverse=True)
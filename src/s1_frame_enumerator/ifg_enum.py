@@ -1,12 +1,15 @@
-import datetime
-import warnings
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 
 import geopandas as gpd
 import pandas as pd
-from shapely import Polygon, STRtree
-from tqdm import tqdm
+from shapely import from_wkb, to_wkb
 
+from .date_enum import enumerate_dates, viable_secondary_date  # noqa: F401
 from .exceptions import InvalidStack
+from .instrumentation import StageStats, progress_bar, stage
+from .pass_footprints import PassFootprints, get_largest_connected_component, get_slcs_over_frame  # noqa: F401
 from .s1_frames import S1Frame
 
 
@@ -19,104 +22,22 @@ ESSENTIAL_S1_SLC_COLUMNS = [
     'geometry',
 ]
 
-
-def get_largest_connected_component(
-    df_slc_pass: gpd.GeoDataFrame, reference_geometry: Polygon | None = None
-) -> gpd.GeoDataFrame:
-    union_geom = df_slc_pass.geometry.union_all()
-
-    if union_geom.geom_type in ('MultiPolygon', 'GeometryCollection'):
-        components = [g for g in union_geom.geoms if g.geom_type == 'Polygon']
-    elif union_geom.geom_type == 'Polygon':
-        components = [union_geom]
-    else:
-        raise ValueError(f'Unexpected geometry type: {union_geom.geom_type}')
-
-    if not components:
-        return gpd.GeoDataFrame(crs=df_slc_pass.crs)
-    if len(components) == 1:
-        return df_slc_pass
-
-    if reference_geometry is not None:
-
-        def intersection_area(component: Polygon) -> float:
-            try:
-                return component.intersection(reference_geometry).area
-            except Exception:
-                return 0.0
-
-        largest_component = max(components, key=intersection_area)
-    else:
-        largest_component = max(components, key=lambda comp: comp.area)
-
-    geo_ind = df_slc_pass.intersects(largest_component)
-    df_slc_pass_largest_component = df_slc_pass[geo_ind].reset_index(drop=True)
-    return df_slc_pass_largest_component
-
-
-def viable_secondary_date(
-    secondary_date: datetime.datetime | pd.Timestamp,
-    reference_date: datetime.datetime | pd.Timestamp,
-    min_temporal_baseline_days: int,
-) -> bool:
-    timedelta = datetime.timedelta(days=min_temporal_baseline_days)
-    cond_1 = secondary_date <= reference_date - timedelta
-    cond_2 = secondary_date != reference_date
-    return cond_1 and cond_2
-
-
-def enumerate_dates(
-    dates: list[pd.Timestamp],
-    min_temporal_baseline_days: int,
-    n_secondary_scenes_per_ref: int = 3,
-    n_init_seeds: int = 1,
-) -> list[tuple]:
-    """Enumerate date pairs.
-
-    Parameters
-    ----------
-    dates : List[datetime.date]
-        List of dates for enumeration (can be unsorted). Should have timezone otherwise comparisons will be invalid.
-    min_temporal_baseline_days : int
-        Ensures ifg pairs must have at least this many days between them
-    n_secondary_scenes_per_ref : int, optional
-        When creating time series, selects at most 3 viable dates to include in subsequent pairs, by default 3
-    n_init_seeds : int, optional
-        How many initial dates to populate the queue with; most recent dates are seeds, by default 1. Must be >= 1.
-
-    Returns
-    -------
-    List[tuple]
-        (reference_date, secondary_date)
-    """
-    sorted_dates = sorted(dates, reverse=True)
-    queue = sorted_dates[:n_init_seeds]
-    dates_visited = [sorted_dates[0]]
-    pairs = []
-
-    neighbors = n_secondary_scenes_per_ref
-    while queue:
-        ref_date = queue.pop(0)
-        available_dates = [
-            date for date in sorted_dates if viable_secondary_date(date, ref_date, min_temporal_baseline_days)
-        ]
-        secondary_dates = [sec_date for sec_date in available_dates[:neighbors]]
-        pairs_temp = [(ref_date, sec_date) for sec_date in secondary_dates]
-        pairs += pairs_temp
-        for sec_date in secondary_dates:
-            if sec_date not in dates_visited:
-                dates_visited.append(sec_date)
-                queue.append(sec_date)
-
-    # Have to de-duplicate pairs (i.e. ensure uniqueness of items) due to seeds.
-    # There are situations when a visited date may be removed from the queue
-    # And then added back with multiple initial date seeds.
-    pairs = list(set(pairs))
-    return sorted(pairs, reverse=True)
+# Columns of `ifgs2gdf` (the keys of each enumerated interferogram other than the SLC lists are scalars)
+IFG_COLUMNS = ['reference', 'secondary', 'reference_date', 'secondary_date', 'frame_id', 'geometry']
+# Number of chunks of (date pair, frame) tasks per worker process when enumerating in parallel
+ENUMERATION_CHUNKS_PER_WORKER = 4
+MAX_ENUMERATION_CHUNK_SIZE = 100
+ENUMERATION_CHUNKS_IN_FLIGHT_PER_WORKER = 2
+# Stack and frames of each worker process of `enumerate_gunw_time_series` (set once by its initializer)
+_WORKER_STATE = {}
 
 
 def select_ifg_pair_from_stack(
-    ref_date: pd.Timestamp, sec_date: pd.Timestamp, df_stack: gpd.GeoDataFrame, frame: S1Frame = None
+    ref_date: pd.Timestamp,
+    sec_date: pd.Timestamp,
+    df_stack: gpd.GeoDataFrame,
+    frame: S1Frame = None,
+    pass_footprints: PassFootprints | None = None,
 ) -> dict:
     if (not isinstance(ref_date, pd.Timestamp)) or (not isinstance(ref_date, pd.Timestamp)):
         raise TypeError('ref and secondary dates must be pd.TimeStamp')
@@ -126,29 +47,27 @@ def select_ifg_pair_from_stack(
     if (str(ref_date.tz).lower() != 'utc') or (str(sec_date.tz).lower() != 'utc'):
         raise TypeError('Timestamp must be in UTC timezone')
 
-    df_stack_subset = df_stack
-    if frame is not None:
-        tree = STRtree(df_stack.geometry)
-        ind_frame = tree.query(frame.frame_geometry, predicate='intersects')
-        df_stack_frame_temp = df_stack.iloc[ind_frame].sort_values(by='slc_id')
-        intersection_geo = df_stack_frame_temp.intersection(frame.frame_geometry)
-        with warnings.catch_warnings():
-            warnings.simplefilter('ignore', category=UserWarning)
-            coverage_ratio = intersection_geo.area / frame.frame_geometry.area
-        geo_ind = coverage_ratio >= 0.01
-        df_stack_subset = df_stack_frame_temp[geo_ind].reset_index(drop=True)
-
-    ref_ind = df_stack_subset.repeat_pass_timestamp == ref_date
-    df_ref = df_stack_subset[ref_ind].reset_index(drop=True)
-    sec_ind = df_stack_subset.repeat_pass_timestamp == sec_date
-    df_sec = df_stack_subset[sec_ind].reset_index(drop=True)
-
-    reference_geometry = frame.frame_geometry if frame else None
-    df_ref = get_largest_connected_component(df_ref, reference_geometry=reference_geometry)
-    df_sec = get_largest_connected_component(df_sec, reference_geometry=reference_geometry)
-
-    ref_geo = df_ref.geometry.union_all()
-    sec_geo = df_sec.geometry.union_all()
+    if pass_footprints is not None:
+        # The SLCs over the frame and largest connected components of each pass are shared by all the pairs
+        df_ref, ref_geo = pass_footprints.largest_connected_component(ref_date, frame=frame)
+        df_sec, sec_geo = pass_footprints.largest_connected_component(sec_date, frame=frame)
+    else:
+        df_stack_subset = df_stack
+        if frame is not None:
+            df_stack_subset = get_slcs_over_frame(df_stack, frame)
+
+        ref_ind = df_stack_subset.repeat_pass_timestamp == ref_date
+        df_ref = df_stack_subset[ref_ind].reset_index(drop=True)
+        sec_ind = df_stack_subset.repeat_pass_timestamp == sec_date
+        df_sec = df_stack_subset[sec_ind].reset_index(drop=True)
+
+        reference_geometry = frame.frame_geometry if frame else None
+        df_ref = get_largest_connected_component(df_ref, reference_geometry=reference_geometry)
+        df_sec = get_largest_connected_component(df_sec, reference_geometry=reference_geometry)
+
+        ref_geo = df_ref.geometry.union_all()
+        sec_geo = df_sec.geometry.union_all()
+
     if frame is None:
         total_intersection_geometry = ref_geo.intersection(sec_geo)
     else:
@@ -173,33 +92,218 @@ def select_ifg_pair_from_stack(
     }
 
 
-def enumerate_gunw_time_series(
+def ifgs2gdf(ifg_data: Iterable[dict], crs: str = 'EPSG:4326') -> gpd.GeoDataFrame:
+    """Table of enumerated interferograms accumulated column by column in a single pass over `ifg_data`.
+
+    Parameters
+    ----------
+    ifg_data : Iterable[dict]
+        Interferograms from `enumerate_gunw_time_series` or `iter_gunw_time_series`
+    crs : str, optional
+        CRS of the geometries, by default 'EPSG:4326'
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        One row per interferogram with `IFG_COLUMNS`: lists of SLC ids, datetime64 UTC dates and a nullable integer
+        frame id (missing when enumerating by track) which can be written directly with `to_parquet`
+    """
+    columns = {column: [] for column in IFG_COLUMNS}
+    for ifg in ifg_data:
+        for column, values in columns.items():
+            values.append(ifg[column])
+
+    df = pd.DataFrame(
+        {
+            'reference': pd.Series(columns['reference'], dtype=object),
+            'secondary': pd.Series(columns['secondary'], dtype=object),
+            'reference_date': pd.to_datetime(columns['reference_date'], utc=True),
+            'secondary_date': pd.to_datetime(columns['secondary_date'], utc=True),
+            'frame_id': pd.array(columns['frame_id'], dtype='Int64'),
+        }
+    )
+    return gpd.GeoDataFrame(df, geometry=gpd.GeoSeries(columns['geometry'], crs=crs), crs=crs)
+
+
+def _init_enumeration_worker(df_stack_wkb: pd.DataFrame, crs: str, frames: list[S1Frame | None]) -> None:
+    df_stack = gpd.GeoDataFrame(
+        df_stack_wkb.drop(columns=['geometry']), geometry=from_wkb(df_stack_wkb.geometry.to_numpy()), crs=crs
+    )
+    _WORKER_STATE['df_stack'] = df_stack
+    _WORKER_STATE['frames'] = frames
+    _WORKER_STATE['pass_footprints'] = PassFootprints.from_stack(df_stack)
+
+
+def _select_ifg_pairs_in_worker(tasks: list[tuple[pd.Timestamp, pd.Timestamp, int]]) -> list[dict]:
+    df_stack, frames, pass_footprints = (
+        _WORKER_STATE['df_stack'],
+        _WORKER_STATE['frames'],
+        _WORKER_STATE['pass_footprints'],
+    )
+    return [
+        select_ifg_pair_from_stack(ref_date, sec_date, df_stack, frames[k], pass_footprints=pass_footprints)
+        for (ref_date, sec_date, k) in tasks
+    ]
+
+
+def _iter_ifg_pairs(
+    df_stack: gpd.GeoDataFrame,
+    ifg_dates: list[tuple],
+    frames: list[S1Frame | None],
+    pass_footprints: PassFootprints,
+    stats: StageStats | None,
+    show_progress: bool,
+) -> Iterator[dict]:
+    cache_hits, cache_misses = pass_footprints.cache_hits, pass_footprints.cache_misses
+    try:
+        # The order ensures we first fix dates and then iterate through
+        # frames. Ensures the data is ordered by date.
+        for ref_date, sec_date in progress_bar(ifg_dates, show=show_progress, desc='Date Pairs'):
+            for frame in frames:
+                with stage(stats, 'select_pairs'):
+                    ifg = select_ifg_pair_from_stack(
+                        ref_date, sec_date, df_stack, frame, pass_footprints=pass_footprints
+                    )
+                if stats is not None and ifg:
+                    stats.add('select_pairs', records=1)
+                yield ifg
+    finally:
+        if stats is not None:
+            stats.add(
+                'select_pairs',
+                cache_hits=pass_footprints.cache_hits - cache_hits,
+                cache_misses=pass_footprints.cache_misses - cache_misses,
+            )
+
+
+def _iter_ifg_pairs_with_workers(
+    df_stack: gpd.GeoDataFrame,
+    ifg_dates: list[tuple],
+    frames: list[S1Frame | None],
+    n_workers: int,
+    stats: StageStats | None,
+    show_progress: bool,
+) -> Iterator[dict]:
+    # Same date-then-frame order split into contiguous chunks (so each worker reuses its cached selections for
+    # nearby dates); the stack geometries are sent to each worker once as WKB rather than with every chunk
+    tasks = [(ref_date, sec_date, k) for (ref_date, sec_date) in ifg_dates for k in range(len(frames))]
+    chunk_size = max(1, -(-len(tasks) // (n_workers * ENUMERATION_CHUNKS_PER_WORKER)))
+    chunk_size = min(chunk_size, MAX_ENUMERATION_CHUNK_SIZE)
+    chunks = (tasks[i : i + chunk_size] for i in range(0, len(tasks), chunk_size))
+    df_stack_wkb = pd.DataFrame(df_stack[ESSENTIAL_S1_SLC_COLUMNS]).assign(geometry=to_wkb(df_stack.geometry))
+
+    with (
+        ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_init_enumeration_worker, initargs=(df_stack_wkb, df_stack.crs, frames)
+        ) as executor,
+        progress_bar(total=len(ifg_dates), show=show_progress, desc='Date Pairs') as progress,
+    ):
+        # Bounded number of chunks in flight so results are not accumulated faster than they are consumed
+        futures = deque()
+
+        def next_results() -> list[dict]:
+            future, n_tasks = futures.popleft()
+            # Only the time spent waiting on the workers is recorded
+            with stage(stats, 'select_pairs'):
+                results = future.result()
+            if stats is not None:
+                stats.add('select_pairs', records=sum(1 for ifg in results if ifg))
+            progress.update(n_tasks / len(frames))
+            return results
+
+        try:
+            for chunk in chunks:
+                futures.append((executor.submit(_select_ifg_pairs_in_worker, chunk), len(chunk)))
+                if len(futures) >= ENUMERATION_CHUNKS_IN_FLIGHT_PER_WORKER * n_workers:
+                    yield from next_results()
+            while futures:
+                yield from next_results()
+        finally:
+            for future, _ in futures:
+                future.cancel()
+
+
+def iter_gunw_time_series(
     df_stack: gpd.GeoDataFrame,
     min_temporal_baseline_days: int = 0,
     n_secondary_scenes_per_ref: int = 3,
     frames: list[S1Frame] = None,
     n_init_seeds: int = 1,
-) -> list[dict]:
+    pass_footprints: PassFootprints | None = None,
+    n_workers: int = 1,
+    stats: StageStats | None = None,
+    show_progress: bool = True,
+) -> Iterator[dict]:
+    """Yield the interferograms of `enumerate_gunw_time_series` (in the same order) as soon as each is selected.
+
+    The stack is validated and the date pairs enumerated when called; the SLCs of each pair are only selected as
+    the iterator is consumed. With `n_workers > 1` a bounded number of chunks of pairs are selected ahead.
+
+    With `stats`, the date enumeration ('enumerate_dates', with the number of date pairs) and the selection of the
+    SLCs of each pair ('select_pairs', with the number of interferograms and the lookups of cached pass footprints
+    when `n_workers` is 1) are recorded as they run.
+
+    `pass_footprints` (by default built from `df_stack`) is only used when `n_workers` is 1; each worker process
+    builds its own from the stack so passing it with `n_workers > 1` raises a ValueError.
+    """
     if [k for k in ESSENTIAL_S1_SLC_COLUMNS if k not in df_stack.columns.tolist()]:
         raise InvalidStack('The stack dataframe must be generated using get_s1_stack')
 
     if df_stack.empty:
         raise InvalidStack('The stack dataframe must be non-empty')
 
+    if pass_footprints is not None and n_workers > 1:
+        raise ValueError('pass_footprints cannot be shared with worker processes; use n_workers=1')
+
     frames = frames or [None]
     dates = df_stack.repeat_pass_timestamp.unique().tolist()
     neighbors = n_secondary_scenes_per_ref
-    ifg_dates = enumerate_dates(
-        dates, min_temporal_baseline_days, n_secondary_scenes_per_ref=neighbors, n_init_seeds=n_init_seeds
-    )
-
-    ifg_data = [
-        select_ifg_pair_from_stack(ref_date, sec_date, df_stack, frame)
-        # The order ensures we first fix dates and then iterate through
-        # frames. Ensures the data is ordered by date.
-        for (ref_date, sec_date) in tqdm(ifg_dates, desc='Date Pairs')
-        for frame in frames
-    ]
+    with stage(stats, 'enumerate_dates'):
+        ifg_dates = enumerate_dates(
+            dates, min_temporal_baseline_days, n_secondary_scenes_per_ref=neighbors, n_init_seeds=n_init_seeds
+        )
+    if stats is not None:
+        stats.add('enumerate_dates', records=len(ifg_dates))
+
+    if n_workers <= 1:
+        pass_footprints = pass_footprints or PassFootprints.from_stack(df_stack)
+        ifg_data = _iter_ifg_pairs(df_stack, ifg_dates, frames, pass_footprints, stats, show_progress)
+    else:
+        ifg_data = _iter_ifg_pairs_with_workers(df_stack, ifg_dates, frames, n_workers, stats, show_progress)
     # Remove empty dictionaries
-    ifg_data = [ifg for ifg in ifg_data if ifg]
-    return ifg_data
+    return (ifg for ifg in ifg_data if ifg)
+
+
+def enumerate_gunw_time_series(
+    df_stack: gpd.GeoDataFrame,
+    min_temporal_baseline_days: int = 0,
+    n_secondary_scenes_per_ref: int = 3,
+    frames: list[S1Frame] = None,
+    n_init_seeds: int = 1,
+    pass_footprints: PassFootprints | None = None,
+    n_workers: int = 1,
+    output_format: str = 'list',
+    stats: StageStats | None = None,
+    show_progress: bool = True,
+) -> list[dict] | gpd.GeoDataFrame:
+    """Enumerate interferograms from a stack (see `iter_gunw_time_series`).
+
+    `output_format` is either 'list' (a dictionary per interferogram) or 'geodataframe' (see `ifgs2gdf`).
+    """
+    if output_format not in ['list', 'geodataframe']:
+        raise ValueError("output_format must be either 'list' or 'geodataframe'")
+
+    ifg_data = iter_gunw_time_series(
+        df_stack,
+        min_temporal_baseline_days=min_temporal_baseline_days,
+        n_secondary_scenes_per_ref=n_secondary_scenes_per_ref,
+        frames=frames,
+        n_init_seeds=n_init_seeds,
+        pass_footprints=pass_footprints,
+        n_workers=n_workers,
+        stats=stats,
+        show_progress=show_progress,
+    )
+    if output_format == 'geodataframe':
+        return ifgs2gdf(ifg_data, crs=df_stack.crs)
+    return list(ifg_data)
@@ -0,0 +1,149 @@
+import cProfile
+import pstats
+import time
+import tracemalloc
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from dataclasses import dataclass
+from typing import Any
+
+import pandas as pd
+
+
+try:
+    from tqdm import tqdm
+except ImportError:  # pragma: no cover
+    tqdm = None
+
+
+@dataclass
+class StageRecord:
+    """Totals of a stage over all the times it ran.
+
+    `peak_memory_bytes` is the largest memory traced by `tracemalloc` while the stage ran (None unless tracing).
+    """
+
+    calls: int = 0
+    seconds: float = 0.0
+    records: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    peak_memory_bytes: int | None = None
+
+
+class StageStats:
+    """Wall time, call, record and cache hit counts of the stages of `get_s1_stack` and `enumerate_gunw_time_series`.
+
+    Pass an instance as `stats` to record into it; without one nothing is recorded. The same instance can be passed
+    to several calls to accumulate their totals. Stages are only timed in the calling thread (queries made
+    concurrently are timed as one stage).
+
+    Parameters
+    ----------
+    callback : Callable[[str, StageRecord], None], optional
+        Called with the name and (cumulative) record of a stage each time it finishes
+    profile : bool, optional
+        Profile the outermost stages with `cProfile` (see `profile_stats`), by default False
+    trace_memory : bool, optional
+        Record the peak memory of each stage with `tracemalloc` (started if not already tracing), by default False.
+        Tracing slows down allocations substantially.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str, StageRecord], None] | None = None,
+        profile: bool = False,
+        trace_memory: bool = False,
+    ) -> None:
+        self.stages: dict[str, StageRecord] = {}
+        self.callback = callback
+        self.profiler = cProfile.Profile() if profile else None
+        self.trace_memory = trace_memory
+        # Peak traced memory of each running stage before its last nested stage started (outermost first)
+        self._running_peaks: list[int] = []
+
+    def record(self, name: str) -> StageRecord:
+        if name not in self.stages:
+            self.stages[name] = StageRecord()
+        return self.stages[name]
+
+    def add(self, name: str, records: int = 0, cache_hits: int = 0, cache_misses: int = 0) -> None:
+        """Add counts to a stage without timing it."""
+        record = self.record(name)
+        record.records += records
+        record.cache_hits += cache_hits
+        record.cache_misses += cache_misses
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageRecord]:
+        """Time a stage; the record is yielded so counts can be added to it."""
+        record = self.record(name)
+        outermost = not self._running_peaks
+        if self.profiler is not None and outermost:
+            self.profiler.enable()
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            if self._running_peaks:
+                self._running_peaks[-1] = max(self._running_peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        self._running_peaks.append(0)
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.seconds += time.perf_counter() - start
+            record.calls += 1
+            peak = self._running_peaks.pop()
+            if self.trace_memory and tracemalloc.is_tracing():
+                peak = max(peak, tracemalloc.get_traced_memory()[1])
+                record.peak_memory_bytes = max(record.peak_memory_bytes or 0, peak)
+                if self._running_peaks:
+                    self._running_peaks[-1] = max(self._running_peaks[-1], peak)
+            if self.profiler is not None and outermost:
+                self.profiler.disable()
+            if self.callback is not None:
+                self.callback(name, record)
+
+    def profile_stats(self, sort: str = 'cumulative') -> pstats.Stats:
+        if self.profiler is None:
+            raise ValueError('Profiling was not enabled (use StageStats(profile=True))')
+        return pstats.Stats(self.profiler).sort_stats(sort)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """One row per stage (in the order they first ran) with the fields of `StageRecord`."""
+        columns = list(StageRecord.__dataclass_fields__)
+        return pd.DataFrame(
+            [[getattr(record, column) for column in columns] for record in self.stages.values()],
+            index=pd.Index(list(self.stages), name='stage'),
+            columns=columns,
+        )
+
+
+def stage(stats: StageStats | None, name: str) -> AbstractContextManager[StageRecord | None]:
+    """`stats.stage(name)` or a no-op context (yielding None) if `stats` is None."""
+    return stats.stage(name) if stats is not None else nullcontext()
+
+
+class _NoProgressBar:
+    def __init__(self, iterable: Iterable | None = None, **kwargs: Any) -> None:  # noqa: ANN401
+        self.iterable = iterable
+
+    def __iter__(self) -> Iterator:
+        return iter(self.iterable)
+
+    def __enter__(self) -> '_NoProgressBar':
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        pass
+
+    def update(self, n: float = 1) -> None:
+        pass
+
+
+def progress_bar(iterable: Iterable | None = None, show: bool = True, **kwargs: Any) -> Any:  # noqa: ANN401
+    """Wrap `iterable` in a tqdm progress bar if `show` and tqdm is installed (otherwise it is passed through)."""
+    if show and tqdm is not None:
+        return tqdm(iterable, **kwargs)
+    return _NoProgressBar(iterable, **kwargs)
@@ -0,0 +1,234 @@
+import warnings
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+from shapely import Polygon, STRtree
+from shapely.geometry.base import BaseGeometry
+
+from .s1_frames import S1Frame
+
+
+# Minimum ratio of a frame that an SLC must cover to be used for an interferogram over the frame
+MINIMUM_SLC_FRAME_COVERAGE_RATIO = 0.01
+# Default number of (pass, frame) largest connected components kept by `PassFootprints`
+MAX_CACHED_COMPONENTS = 4_096
+
+
+def get_polygonal_components(geometry: BaseGeometry) -> list[Polygon]:
+    """Polygons making up the connected components of a union of SLC footprints."""
+    if geometry.geom_type in ('MultiPolygon', 'GeometryCollection'):
+        return [g for g in geometry.geoms if g.geom_type == 'Polygon']
+    elif geometry.geom_type == 'Polygon':
+        return [geometry]
+    else:
+        raise ValueError(f'Unexpected geometry type: {geometry.geom_type}')
+
+
+def get_largest_connected_component(
+    df_slc_pass: gpd.GeoDataFrame, reference_geometry: Polygon | None = None
+) -> gpd.GeoDataFrame:
+    union_geom = df_slc_pass.geometry.union_all()
+    components = get_polygonal_components(union_geom)
+
+    if not components:
+        return gpd.GeoDataFrame(crs=df_slc_pass.crs)
+    if len(components) == 1:
+        return df_slc_pass
+
+    if reference_geometry is not None:
+
+        def intersection_area(component: Polygon) -> float:
+            try:
+                return component.intersection(reference_geometry).area
+            except Exception:
+                return 0.0
+
+        largest_component = max(components, key=intersection_area)
+    else:
+        largest_component = max(components, key=lambda comp: comp.area)
+
+    geo_ind = df_slc_pass.intersects(largest_component)
+    df_slc_pass_largest_component = df_slc_pass[geo_ind].reset_index(drop=True)
+    return df_slc_pass_largest_component
+
+
+def get_slcs_over_frame(df_stack: gpd.GeoDataFrame, frame: S1Frame, tree: STRtree | None = None) -> gpd.GeoDataFrame:
+    """SLCs of the stack covering at least `MINIMUM_SLC_FRAME_COVERAGE_RATIO` of the frame (sorted by `slc_id`).
+
+    Parameters
+    ----------
+    df_stack : gpd.GeoDataFrame
+    frame : S1Frame
+    tree : STRtree, optional
+        Spatial index of the stack geometries, by default one is built
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+    """
+    tree = tree if tree is not None else STRtree(df_stack.geometry)
+    ind_frame = tree.query(frame.frame_geometry, predicate='intersects')
+    df_stack_frame_temp = df_stack.iloc[ind_frame].sort_values(by='slc_id')
+    intersection_geo = df_stack_frame_temp.intersection(frame.frame_geometry)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', category=UserWarning)
+        coverage_ratio = intersection_geo.area / frame.frame_geometry.area
+    geo_ind = coverage_ratio >= MINIMUM_SLC_FRAME_COVERAGE_RATIO
+    return df_stack_frame_temp[geo_ind].reset_index(drop=True)
+
+
+@dataclass
+class PassFootprints:
+    """Footprints of each repeat pass of a stack, computed once and shared by the stack filters and enumeration.
+
+    Everything is computed lazily and cached: the dissolved passes, the SLC rows of each pass, a spatial index of the
+    stack, and the SLCs within the largest connected component of each pass (overall or per frame). `cache_hits` and
+    `cache_misses` count the lookups of the largest connected components.
+
+    There is a largest connected component per pass and frame, so only the `max_cached_components` most recently used
+    are kept. Enumeration pairs each date with its nearest neighbors so the components it reuses stay in the cache.
+
+    Parameters
+    ----------
+    df_stack : gpd.GeoDataFrame
+        Stack from `get_s1_stack`; it should not be modified once the footprints are computed
+    max_cached_components : int, optional
+        Number of largest connected components kept, by default `MAX_CACHED_COMPONENTS`. None means no limit.
+    """
+
+    df_stack: gpd.GeoDataFrame = field(repr=False)
+    max_cached_components: int | None = MAX_CACHED_COMPONENTS
+    _df_passes: gpd.GeoDataFrame | None = field(default=None, repr=False)
+    _largest_components: OrderedDict[tuple, tuple[gpd.GeoDataFrame, BaseGeometry]] = field(
+        default_factory=OrderedDict, repr=False
+    )
+    _frame_slcs: dict[tuple, tuple[gpd.GeoDataFrame, dict[pd.Timestamp, np.ndarray]]] = field(
+        default_factory=dict, repr=False
+    )
+    cache_hits: int = field(default=0, repr=False)
+    cache_misses: int = field(default=0, repr=False)
+
+    @classmethod
+    def from_stack(
+        cls,
+        df_stack: gpd.GeoDataFrame,
+        reuse: 'PassFootprints | None' = None,
+        max_cached_components: int | None = MAX_CACHED_COMPONENTS,
+    ) -> 'PassFootprints':
+        """Footprints of the passes of a stack.
+
+        Parameters
+        ----------
+        df_stack : gpd.GeoDataFrame
+            Stack from `get_s1_stack`
+        reuse : PassFootprints, optional
+            Footprints of a stack from which `df_stack` was obtained by removing entire passes (e.g. with the stack
+            filters); the pass geometries are reused rather than recomputed
+        max_cached_components : int, optional
+            Number of largest connected components kept, by default `MAX_CACHED_COMPONENTS`. None means no limit.
+
+        Returns
+        -------
+        PassFootprints
+        """
+        df_passes = None
+        if reuse is not None:
+            ind = reuse.df_passes.repeat_pass_timestamp.isin(df_stack.repeat_pass_timestamp)
+            df_passes = reuse.df_passes[ind].reset_index(drop=True)
+        return cls(df_stack=df_stack, max_cached_components=max_cached_components, _df_passes=df_passes)
+
+    @property
+    def df_passes(self) -> gpd.GeoDataFrame:
+        """One row per `repeat_pass_timestamp` (sorted) with the union of the SLC footprints and earliest `start_time`.
+
+        Equivalent to `df_stack.dissolve(by='repeat_pass_timestamp')`.
+        """
+        if self._df_passes is None:
+            self._df_passes = self.df_stack.dissolve(
+                by='repeat_pass_timestamp', aggfunc={'start_time': 'min'}, as_index=False
+            )
+        return self._df_passes
+
+    @cached_property
+    def slc_indices(self) -> dict[pd.Timestamp, np.ndarray]:
+        """Positional rows of the stack for each `repeat_pass_timestamp`."""
+        return self.df_stack.groupby('repeat_pass_timestamp').indices
+
+    @cached_property
+    def tree(self) -> STRtree:
+        """Spatial index of the SLC footprints of the stack."""
+        return STRtree(self.df_stack.geometry)
+
+    @cached_property
+    def _geometries(self) -> dict[pd.Timestamp, BaseGeometry]:
+        return dict(zip(self.df_passes.repeat_pass_timestamp, self.df_passes.geometry))
+
+    def geometry(self, pass_timestamp: pd.Timestamp) -> BaseGeometry:
+        return self._geometries[pass_timestamp]
+
+    def slcs_over_frame(self, frame: S1Frame) -> tuple[gpd.GeoDataFrame, dict[pd.Timestamp, np.ndarray]]:
+        """SLCs used for interferograms over a frame (see `get_slcs_over_frame`) and their positional rows per pass."""
+        key = (frame.frame_id, frame.hemisphere)
+        if key not in self._frame_slcs:
+            df_frame = get_slcs_over_frame(self.df_stack, frame, tree=self.tree)
+            self._frame_slcs[key] = df_frame, df_frame.groupby('repeat_pass_timestamp').indices
+        return self._frame_slcs[key]
+
+    def largest_connected_component(
+        self, pass_timestamp: pd.Timestamp, frame: S1Frame | None = None
+    ) -> tuple[gpd.GeoDataFrame, BaseGeometry]:
+        """SLCs of a pass within its largest connected component and the union of their footprints.
+
+        Equivalent to `get_largest_connected_component` applied to the SLCs of the pass (restricted to those over the
+        frame with the frame as the reference geometry if a frame is given) but cached per pass and frame (up to
+        `max_cached_components`, least recently used first out).
+
+        Parameters
+        ----------
+        pass_timestamp : pd.Timestamp
+        frame : S1Frame, optional
+
+        Returns
+        -------
+        tuple[gpd.GeoDataFrame, BaseGeometry]
+            SLCs and their union
+        """
+        key = (pass_timestamp, frame.frame_id, frame.hemisphere) if frame is not None else (pass_timestamp,)
+        if key in self._largest_components:
+            self.cache_hits += 1
+            self._largest_components.move_to_end(key)
+            return self._largest_components[key]
+        self.cache_misses += 1
+
+        if frame is not None:
+            df_frame, frame_slc_indices = self.slcs_over_frame(frame)
+            df_pass = df_frame.iloc[frame_slc_indices.get(pass_timestamp, [])].reset_index(drop=True)
+            df_pass = get_largest_connected_component(df_pass, reference_geometry=frame.frame_geometry)
+            result = df_pass, df_pass.geometry.union_all()
+        else:
+            components = []
+            if pass_timestamp in self.slc_indices:
+                pass_geometry = self.geometry(pass_timestamp)
+                components = get_polygonal_components(pass_geometry)
+
+            if not components:
+                # Same as get_largest_connected_component applied to no SLCs
+                df_pass = gpd.GeoDataFrame(crs=self.df_stack.crs)
+                result = df_pass, df_pass.geometry.union_all()
+            else:
+                df_pass = self.df_stack.iloc[self.slc_indices[pass_timestamp]].reset_index(drop=True)
+                if len(components) == 1:
+                    result = df_pass, pass_geometry
+                else:
+                    largest_component = max(components, key=lambda comp: comp.area)
+                    df_pass = df_pass[df_pass.intersects(largest_component)].reset_index(drop=True)
+                    result = df_pass, df_pass.geometry.union_all()
+
+        self._largest_components[key] = result
+        if self.max_cached_components is not None and len(self._largest_components) > self.max_cached_components:
+            self._largest_components.popitem(last=False)
+        return result
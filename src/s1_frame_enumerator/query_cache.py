@@ -0,0 +1,164 @@
+import datetime
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+from collections.abc import Iterator
+from contextlib import closing, contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from .s1_frames import S1Frame, get_catalog_cache_dir
+
+
+def make_query_key(
+    frame: S1Frame,
+    max_results_per_frame: int,
+    allowable_polarizations: list[str],
+    start_time: datetime.datetime | str | None,
+    stop_time: datetime.datetime | str | None,
+    columnar: bool = False,
+) -> str:
+    def serialize_time(t: datetime.datetime | str | None) -> str | None:
+        return t.isoformat() if hasattr(t, 'isoformat') else t
+
+    key = {
+        'frame_id': int(frame.frame_id),
+        'hemisphere': frame.hemisphere,
+        'track_numbers': sorted(int(tn) for tn in frame.track_numbers),
+        'polarizations': sorted(allowable_polarizations),
+        'start_time': serialize_time(start_time),
+        'stop_time': serialize_time(stop_time),
+        'max_results': max_results_per_frame,
+    }
+    if columnar:
+        key['columnar'] = True
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+class QueryCache:
+    """Persistent SQLite cache of SLC metadata queries over frames.
+
+    Entries (geojson results or tables from `asf_results_to_table`) are stored as compressed JSON keyed on the
+    query parameters (see `make_query_key`). Entries older than `ttl_seconds` are never returned and the least
+    recently used entries are evicted once the cache exceeds `max_size_bytes`; a single result larger than
+    `max_size_bytes` is not stored. The cache can be shared across
+    threads; each operation uses its own connection.
+
+    Parameters
+    ----------
+    path : Path | str, optional
+        SQLite database, by default `slc_query_cache.sqlite` in the package cache directory
+    ttl_seconds : float, optional
+        Maximum age of an entry, by default one day. None means entries never expire.
+    max_size_bytes : int, optional
+        Maximum size of the (compressed) entries, by default 1 GB. None means no size limit.
+    bypass : bool, optional
+        Skip reading the cache (every lookup is a miss) but still store fresh results, by default False
+    """
+
+    def __init__(
+        self,
+        path: Path | str | None = None,
+        ttl_seconds: float | None = 86_400,
+        max_size_bytes: int | None = 1_000_000_000,
+        bypass: bool = False,
+    ) -> None:
+        self.path = Path(path) if path is not None else get_catalog_cache_dir() / 'slc_query_cache.sqlite'
+        self.ttl_seconds = ttl_seconds
+        self.max_size_bytes = max_size_bytes
+        self.bypass = bypass
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as con:
+            con.execute(
+                'CREATE TABLE IF NOT EXISTS queries ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, '
+                'created_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        with closing(sqlite3.connect(self.path, timeout=30)) as con, con:
+            yield con
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> list[dict] | pd.DataFrame | None:
+        if self.bypass:
+            self._count(hit=False)
+            return None
+        now = time.time()
+        with self._connect() as con:
+            row = con.execute('SELECT value, created_at FROM queries WHERE key = ?', (key,)).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                con.execute('DELETE FROM queries WHERE key = ?', (key,))
+                row = None
+            if row is not None:
+                con.execute('UPDATE queries SET accessed_at = ? WHERE key = ?', (now, key))
+        self._count(hit=row is not None)
+        return _deserialize(row[0]) if row is not None else None
+
+    def put(self, key: str, results: list[dict] | pd.DataFrame) -> None:
+        value = _serialize(results)
+        now = time.time()
+        with self._connect() as con:
+            if self.max_size_bytes is not None and len(value) > self.max_size_bytes:
+                con.execute('DELETE FROM queries WHERE key = ?', (key,))
+                return
+            con.execute(
+                'INSERT OR REPLACE INTO queries (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, value, len(value), now, now),
+            )
+            self._evict(con, now)
+
+    def _evict(self, con: sqlite3.Connection, now: float) -> None:
+        if self.ttl_seconds is not None:
+            con.execute('DELETE FROM queries WHERE created_at < ?', (now - self.ttl_seconds,))
+        if self.max_size_bytes is None:
+            return
+        total_size = con.execute('SELECT COALESCE(SUM(size), 0) FROM queries').fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+        keys_to_delete = []
+        for key, size in con.execute('SELECT key, size FROM queries ORDER BY accessed_at ASC'):
+            if total_size <= self.max_size_bytes:
+                break
+            keys_to_delete.append((key,))
+            total_size -= size
+        con.executemany('DELETE FROM queries WHERE key = ?', keys_to_delete)
+
+    def clear(self) -> None:
+        with self._connect() as con:
+            con.execute('DELETE FROM queries')
+
+    def stats(self) -> dict:
+        with self._connect() as con:
+            n_entries, size = con.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM queries').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'entries': n_entries, 'size_bytes': size}
+
+
+def _serialize(results: list[dict] | pd.DataFrame) -> bytes:
+    if isinstance(results, pd.DataFrame):
+        table = results.assign(geometry=results['geometry'].map(bytes.hex)).to_dict('list')
+        results = {'table': table}
+    return zlib.compress(json.dumps(results).encode())
+
+
+def _deserialize(value: bytes) -> list[dict] | pd.DataFrame:
+    results = json.loads(zlib.decompress(value))
+    if isinstance(results, dict):
+        table = pd.DataFrame(results['table'])
+        table['geometry'] = table['geometry'].map(bytes.fromhex)
+        return table
+    return results
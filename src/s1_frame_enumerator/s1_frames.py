@@ -1,13 +1,15 @@
-from dataclasses import asdict, dataclass, field
+import hashlib
+import os
+from dataclasses import dataclass, field
 from functools import lru_cache
 from pathlib import Path
 from warnings import warn
 
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from rasterio.crs import CRS
-from shapely import force_2d, orient_polygons
-from shapely.geometry import Polygon
+from shapely import STRtree, bounds, centroid, force_2d, get_x, intersects, orient_polygons
+from shapely.geometry import Polygon, box
 
 
 FRAMES_DIR = Path(__file__).parent / 'data'
@@ -15,95 +17,394 @@ FRAMES_PATH = (FRAMES_DIR / 's1_frames_latitude_aligned.geojson.zip').resolve()
 GUNW_EXTENTS_PATH = FRAMES_DIR / 's1_gunw_frame_footprints.geojson.zip'
 GUNW_EXTENTS_PATH = GUNW_EXTENTS_PATH.resolve()
 
+# Bump when the preprocessing applied in `read_catalog` changes so existing caches are rebuilt
+CATALOG_CACHE_VERSION = 1
+FRAME_COLUMN_RENAMES = {
+    'relative_orbit_number_min': 'track_number_min',
+    'relative_orbit_number_max': 'track_number_max',
+}
+
+HEMISPHERE_BOXES = {'west': box(-180, -90, 0, 90), 'east': box(0, -90, 180, 90)}
+
 
 def normalize_geometry(geometry: Polygon) -> Polygon:
     return orient_polygons(force_2d(geometry), exterior_cw=False)
 
 
+def get_catalog_cache_dir() -> Path:
+    """Directory for the GeoParquet catalog caches; set S1_FRAME_ENUMERATOR_CACHE_DIR to override."""
+    cache_dir = os.environ.get('S1_FRAME_ENUMERATOR_CACHE_DIR')
+    if cache_dir:
+        return Path(cache_dir)
+    return Path.home() / '.cache' / 's1_frame_enumerator'
+
+
+def get_catalog_cache_prefix(source_path: Path) -> str:
+    """Prefix of the cache file names of a source archive (other installs sharing the cache directory differ)."""
+    source_digest = hashlib.sha256(str(source_path.resolve()).encode()).hexdigest()[:16]
+    stem = source_path.name.split('.')[0]
+    return f'{stem}-{source_digest}-'
+
+
+def get_catalog_cache_path(source_path: Path) -> Path:
+    stat = source_path.stat()
+    key = f'{stat.st_size}-{stat.st_mtime_ns}-{CATALOG_CACHE_VERSION}'
+    digest = hashlib.sha256(key.encode()).hexdigest()[:16]
+    return get_catalog_cache_dir() / f'{get_catalog_cache_prefix(source_path)}{digest}.parquet'
+
+
+def read_catalog(source_path: Path, rename_columns: dict[str, str] | None = None) -> gpd.GeoDataFrame:
+    """Read a zipped GeoJSON catalog through a GeoParquet cache.
+
+    The cache stores the catalog with the column renames and geometry normalization already applied. Its file
+    name is keyed on the path, size and modification time of the source archive so a stale cache is never read and
+    is instead rebuilt; rebuilding only removes the stale caches of the same source path. If pyarrow is not
+    installed or the cache directory is not writable, the source archive is read directly.
+
+    Parameters
+    ----------
+    source_path : Path
+        Zipped GeoJSON of the catalog
+    rename_columns : dict[str, str], optional
+        Column renames applied to the source
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+    """
+    cache_path = get_catalog_cache_path(source_path)
+    if cache_path.exists():
+        try:
+            return gpd.read_parquet(cache_path)
+        except (ImportError, OSError, ValueError):
+            # No pyarrow or a corrupt cache - read the source and rebuild below
+            pass
+
+    df_catalog = gpd.read_file(source_path)
+    df_catalog = df_catalog.rename(columns=rename_columns or {})
+    df_catalog.geometry = normalize_geometry(df_catalog.geometry.values)
+
+    tmp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        df_catalog.to_parquet(tmp_path)
+        tmp_path.replace(cache_path)
+        # Only the stale caches of this source archive
+        for stale_path in cache_path.parent.glob(f'{get_catalog_cache_prefix(source_path)}*.parquet'):
+            if stale_path != cache_path:
+                stale_path.unlink(missing_ok=True)
+    except (ImportError, OSError):
+        pass
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return df_catalog
+
+
 @lru_cache
 def get_global_s1_frames() -> gpd.GeoDataFrame:
-    df_frames = gpd.read_file(FRAMES_PATH)
-    df_frames = df_frames.rename(
-        columns={'relative_orbit_number_min': 'track_number_min', 'relative_orbit_number_max': 'track_number_max'}
-    )
-    return df_frames
+    return read_catalog(FRAMES_PATH, rename_columns=FRAME_COLUMN_RENAMES)
 
 
 @lru_cache
 def get_global_gunw_footprints() -> gpd.GeoDataFrame:
-    return gpd.read_file(GUNW_EXTENTS_PATH)
+    return read_catalog(GUNW_EXTENTS_PATH)
 
 
-def get_geometry_by_id(frame_id: int, geometry_type: str, hemisphere: str = None) -> gpd.GeoDataFrame:
+@lru_cache
+def get_global_s1_frames_tree() -> STRtree:
+    return STRtree(get_global_s1_frames().geometry.values)
+
+
+@lru_cache
+def get_global_gunw_footprints_tree() -> STRtree:
+    return STRtree(get_global_gunw_footprints().geometry.values)
+
+
+def get_catalog_by_geometry_type(geometry_type: str) -> tuple[gpd.GeoDataFrame, STRtree]:
     if geometry_type not in ['footprint', 'frame']:
         raise ValueError('geometry_type must be either "footprint" or "frame"')
+    if geometry_type == 'frame':
+        return get_global_s1_frames(), get_global_s1_frames_tree()
+    return get_global_gunw_footprints(), get_global_gunw_footprints_tree()
+
+
+@lru_cache
+def get_frame_id_index(geometry_type: str) -> dict[tuple[int, str | None], np.ndarray]:
+    """Map (frame_id, hemisphere) to the positional rows of the catalog holding its geometries.
+
+    The hemisphere of `None` refers to all the rows associated with a frame_id. The "east" and "west" rows are
+    those intersecting the respective hemisphere (as in `.cx[0:180, :]` and `.cx[-180:0, :]`) and only differ
+    from the former for frames that are split at the dateline.
+    """
+    df_catalog, _ = get_catalog_by_geometry_type(geometry_type)
+    frame_ids = df_catalog.frame_id.to_numpy()
+    index = {(frame_id, None): rows for frame_id, rows in pd.Series(frame_ids).groupby(frame_ids).indices.items()}
+    for hemisphere, hemisphere_box in HEMISPHERE_BOXES.items():
+        positions = np.flatnonzero(intersects(df_catalog.geometry.values, hemisphere_box))
+        grouped = pd.Series(positions).groupby(frame_ids[positions]).indices
+        index.update({(frame_id, hemisphere): positions[rows] for frame_id, rows in grouped.items()})
+    return index
+
+
+@lru_cache
+def get_catalog_bounds(geometry_type: str) -> np.ndarray:
+    """Bounds (xmin, ymin, xmax, ymax) of each geometry of a catalog (in catalog order)."""
+    df_catalog, _ = get_catalog_by_geometry_type(geometry_type)
+    return bounds(df_catalog.geometry.values)
+
+
+@lru_cache
+def get_default_hemispheres() -> dict[int, str]:
+    """Hemisphere of each frame when none is specified.
+
+    It is the hemisphere of the centroid of the first geometry of the frame in the catalog, i.e. the geometry used
+    by `S1Frame(frame_id)`; frames split at the dateline have a geometry in each hemisphere.
+    """
+    df_frames = get_global_s1_frames()
+    first_rows = {
+        frame_id: rows[0] for (frame_id, hemisphere), rows in get_frame_id_index('frame').items() if not hemisphere
+    }
+    c_x = get_x(centroid(df_frames.geometry.values[list(first_rows.values())]))
+    return dict(zip(first_rows, np.where(c_x < 0, 'west', 'east').tolist()))
+
+
+def get_catalog_rows_by_id(frame_id: int, geometry_type: str, hemisphere: str = None) -> np.ndarray:
     if (hemisphere is not None) and (hemisphere not in ['east', 'west']):
         raise ValueError('Only "east" or "west" for hemisphere is accepted.')
-    df_frames = get_global_s1_frames() if geometry_type == 'frame' else get_global_gunw_footprints()
-    df_frame = df_frames[df_frames.frame_id == frame_id].reset_index(drop=True)
-    if hemisphere is not None:
-        df_frame = df_frame.cx[-180:0, :] if (hemisphere == 'west') else df_frame.cx[0:180, :]
-        df_frame = df_frame.reset_index(drop=True)
-    if df_frame.shape[0] > 1:
+    rows = get_frame_id_index(geometry_type).get((frame_id, hemisphere))
+    if rows is None:
+        raise ValueError('The id requested is invalid')
+    if rows.size > 1:
         warn(
             'The frame you requested has multiple geometries associated to it.This is due to the dateline',
             category=UserWarning,
         )
-    if df_frame.shape[0] == 0:
-        raise ValueError('The id requested is invalid')
-    df_frame.geometry = df_frame.geometry.map(normalize_geometry)
-    return df_frame
+    return rows
+
+
+def get_geometry_by_id(frame_id: int, geometry_type: str, hemisphere: str = None) -> gpd.GeoDataFrame:
+    rows = get_catalog_rows_by_id(frame_id, geometry_type, hemisphere=hemisphere)
+    df_catalog, _ = get_catalog_by_geometry_type(geometry_type)
+    return df_catalog.iloc[rows].reset_index(drop=True)
+
+
+# Frames interned by `S1Frame` and the global catalogs they were read from (see `get_interned_frames`)
+_INTERNED_FRAMES: dict[tuple[type, int, str | None], 'S1Frame'] = {}
+_INTERNED_FRAMES_CATALOGS: list[gpd.GeoDataFrame] = []
+
+
+def get_interned_frames() -> dict[tuple[type, int, str | None], 'S1Frame']:
+    """Frames constructed so far keyed on their class and the (frame_id, hemisphere) they were requested with.
+
+    There is at most one entry per (frame_id, hemisphere) of the catalog (and requested hemisphere) so the table is
+    bounded by the size of the catalog. It is emptied whenever the global catalogs are reloaded (e.g. after
+    `get_global_s1_frames.cache_clear()`) so frames of a previous catalog are never returned.
+    """
+    catalogs = [get_global_s1_frames(), get_global_gunw_footprints()]
+    if len(_INTERNED_FRAMES_CATALOGS) != len(catalogs) or any(
+        catalog is not interned_catalog for catalog, interned_catalog in zip(catalogs, _INTERNED_FRAMES_CATALOGS)
+    ):
+        _INTERNED_FRAMES.clear()
+        _INTERNED_FRAMES_CATALOGS[:] = catalogs
+    return _INTERNED_FRAMES
+
+
+class _InternedFrameType(type):
+    """Metaclass of `S1Frame` so that repeated `S1Frame(frame_id, hemisphere)` calls return a shared instance."""
+
+    def __call__(cls, frame_id: int, hemisphere: str | None = None) -> 'S1Frame':
+        interned_frames = get_interned_frames()
+        frame = interned_frames.get((cls, frame_id, hemisphere))
+        if frame is not None:
+            # Same validation (and dateline warning) as constructing the frame
+            get_catalog_rows_by_id(frame_id, 'frame', hemisphere=hemisphere)
+            return frame
+        frame = super().__call__(frame_id, hemisphere=hemisphere)
+        # Share the instance with the frame requested with the resolved hemisphere if it is the same frame
+        resolved_frame = interned_frames.setdefault((cls, frame_id, frame.hemisphere), frame)
+        frame = resolved_frame if resolved_frame == frame else frame
+        return interned_frames.setdefault((cls, frame_id, hemisphere), frame)
 
 
-@dataclass
-class S1Frame:
+@dataclass(frozen=True, slots=True)
+class S1Frame(metaclass=_InternedFrameType):
+    """A frame of the global catalog with its GUNW footprint.
+
+    Frames are immutable and hashed on (frame_id, hemisphere) so they can be used as dict or cache keys. They are
+    interned: constructing the same frame again (or with `from_ids`) returns the same instance.
+    """
+
     frame_id: int
     hemisphere: str | None = None
-    track_numbers: list[int] = field(init=False)
+    track_numbers: tuple[int, ...] = field(init=False)
     frame_geometry: Polygon = field(init=False)
     footprint_geometry: Polygon = field(init=False)
 
     def __post_init__(self) -> None:
-        df_frame = get_geometry_by_id(self.frame_id, 'frame', hemisphere=self.hemisphere)
-        # Frame Geometry lookup
-        self.frame_geometry = df_frame.geometry.iloc[0]
-        # Recompute hemisphere if necessary
-        if self.hemisphere is None:
-            c_x = self.frame_geometry.centroid.x
-            self.hemisphere = 'west' if c_x < 0 else 'east'
-        # Track number lookup
-        tn_min = df_frame.track_number_min.iloc[0]
-        tn_max = df_frame.track_number_max.iloc[0]
-        self.track_numbers = list({tn_min, tn_max})
+        df_frames = get_global_s1_frames()
+        frame_row = get_catalog_rows_by_id(self.frame_id, 'frame', hemisphere=self.hemisphere)[0]
+        # Hemisphere of the frame geometry if not specified
+        hemisphere = self.hemisphere
+        if hemisphere is None:
+            hemisphere = get_default_hemispheres()[self.frame_id]
         # Footprint lookup
-        df_footprint = get_geometry_by_id(self.frame_id, 'footprint', hemisphere=self.hemisphere)
-        self.footprint_geometry = df_footprint.geometry.iloc[0]
+        footprint_row = get_catalog_rows_by_id(self.frame_id, 'footprint', hemisphere=hemisphere)[0]
+        self._set_catalog_fields(
+            hemisphere,
+            df_frames.track_number_min.values[frame_row],
+            df_frames.track_number_max.values[frame_row],
+            df_frames.geometry.values[frame_row],
+            get_global_gunw_footprints().geometry.values[footprint_row],
+        )
+
+    def _set_catalog_fields(
+        self, hemisphere: str, tn_min: int, tn_max: int, frame_geometry: Polygon, footprint_geometry: Polygon
+    ) -> None:
+        # Bypasses the frozen __setattr__ while the frame is constructed
+        object.__setattr__(self, 'hemisphere', hemisphere)
+        object.__setattr__(self, 'track_numbers', tuple(sorted({int(tn_min), int(tn_max)})))
+        object.__setattr__(self, 'frame_geometry', frame_geometry)
+        object.__setattr__(self, 'footprint_geometry', footprint_geometry)
+
+    def __hash__(self) -> int:
+        return hash((self.frame_id, self.hemisphere))
 
     def to_gdf(self, use_footprint_geometry: bool = False) -> gpd.GeoDataFrame:
         return frames2gdf([self], use_footprint_geometry=use_footprint_geometry)
 
+    @classmethod
+    def from_ids(cls, frame_ids: list[int], hemisphere: str | None = None) -> list['S1Frame']:
+        """Construct many frames at once from a single lookup against the global catalogs.
 
-def get_overlapping_s1_frames(
-    geometry: Polygon,
-    track_numbers: list[int] = None,
-) -> gpd.GeoDataFrame:
-    df_s1_frames = get_global_s1_frames()
+        Equivalent to `[S1Frame(frame_id, hemisphere=hemisphere) for frame_id in frame_ids]`, including the interned
+        instances.
+
+        Parameters
+        ----------
+        frame_ids : list[int]
+        hemisphere : str | None, optional
+            Either "east", "west" or None (inferred from the frame geometry), by default None.
+
+        Returns
+        -------
+        list[S1Frame]
+        """
+        df_frames = get_global_s1_frames()
+        frame_rows = np.array(
+            [get_catalog_rows_by_id(frame_id, 'frame', hemisphere=hemisphere)[0] for frame_id in frame_ids],
+            dtype=int,
+        )
+        interned_frames = get_interned_frames()
+        new = [k for (k, frame_id) in enumerate(frame_ids) if (cls, frame_id, hemisphere) not in interned_frames]
+        if not new:
+            return [interned_frames[(cls, frame_id, hemisphere)] for frame_id in frame_ids]
+
+        new_frame_ids = [frame_ids[k] for k in new]
+        new_frame_rows = frame_rows[new]
+        if hemisphere is None:
+            default_hemispheres = get_default_hemispheres()
+            hemispheres = [default_hemispheres[frame_id] for frame_id in new_frame_ids]
+        else:
+            hemispheres = [hemisphere] * len(new_frame_ids)
+        footprint_rows = np.array(
+            [
+                get_catalog_rows_by_id(frame_id, 'footprint', hemisphere=hemi)[0]
+                for frame_id, hemi in zip(new_frame_ids, hemispheres)
+            ],
+            dtype=int,
+        )
+        frame_geometries = df_frames.geometry.values[new_frame_rows]
+        footprint_geometries = get_global_gunw_footprints().geometry.values[footprint_rows]
+        tn_mins = df_frames.track_number_min.values[new_frame_rows]
+        tn_maxs = df_frames.track_number_max.values[new_frame_rows]
+
+        for k, frame_id in enumerate(new_frame_ids):
+            if (cls, frame_id, hemisphere) in interned_frames:
+                # Repeated frame_id
+                continue
+            frame = object.__new__(cls)
+            object.__setattr__(frame, 'frame_id', frame_id)
+            frame._set_catalog_fields(
+                hemispheres[k], tn_mins[k], tn_maxs[k], frame_geometries[k], footprint_geometries[k]
+            )
+            resolved_frame = interned_frames.setdefault((cls, frame_id, hemispheres[k]), frame)
+            frame = resolved_frame if resolved_frame == frame else frame
+            interned_frames[(cls, frame_id, hemisphere)] = frame
+        return [interned_frames[(cls, frame_id, hemisphere)] for frame_id in frame_ids]
+
+
+def query_overlapping_frame_indices(
+    geometries: list[Polygon], geometry_type: str = 'frame'
+) -> tuple[np.ndarray, np.ndarray]:
+    """Find catalog rows intersecting each geometry using the global spatial index.
+
+    The index query first prunes candidates by bounding box and then applies the exact intersects predicate
+    to the survivors, so the full catalog is never scanned.
+
+    Parameters
+    ----------
+    geometries : list[Polygon]
+        AOIs to query; each must be less than 180 degrees in width.
+    geometry_type : str, optional
+        Either "frame" or "footprint", by default "frame".
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Positional indices (aoi_index, catalog_index) of each intersecting pair, sorted by AOI and then by
+        catalog order.
+    """
+    _, tree = get_catalog_by_geometry_type(geometry_type)
+    geometries = np.asarray(geometries, dtype=object)
+    for geometry in geometries:
+        xmin, _, xmax, _ = geometry.bounds
+        if xmax - xmin > 180:
+            raise ValueError('Your geometry needs to be less than 180 degrees in width')
     # Note that intersection across frames near dateline will be correct as geometries are separated
-    ind = df_s1_frames.intersects(geometry)
-    df_overlapping_frames = df_s1_frames[ind].reset_index(drop=True)
+    aoi_ind, catalog_ind = tree.query(geometries, predicate='intersects')
+    order = np.lexsort((catalog_ind, aoi_ind))
+    return aoi_ind[order], catalog_ind[order]
+
+
+def _filter_rows_by_track_numbers(catalog_ind: np.ndarray, track_numbers: list[int] | None) -> np.ndarray:
+    if track_numbers and catalog_ind.size:
+        df_frames = get_global_s1_frames()
+        ind_0 = np.isin(df_frames.track_number_min.values[catalog_ind], track_numbers)
+        ind_1 = np.isin(df_frames.track_number_max.values[catalog_ind], track_numbers)
+        catalog_ind = catalog_ind[ind_0 | ind_1]
+    return catalog_ind
 
-    xmin, _, xmax, _ = geometry.bounds
+
+def get_hemisphere_from_bounds(xmin: float, xmax: float) -> str | None:
+    """Hemisphere of frames spanning [xmin, xmax] if they touch the dateline (see `gdf2frames`)."""
     if xmax - xmin > 180:
-        raise ValueError('Your geometry needs to be less than 180 degrees in width')
+        raise ValueError('The frames span more than 180 degrees; break apart your request')
+    hemisphere = None
+    if xmin <= -180:
+        hemisphere = 'west'
+    if xmax >= 180:
+        hemisphere = 'east'
+    return hemisphere
+
+
+def catalog_rows2frames(catalog_ind: np.ndarray) -> list[S1Frame]:
+    """Convert rows of the frame catalog to frames as `gdf2frames` does but with the precomputed bounds."""
+    if not catalog_ind.size:
+        return []
+    catalog_bounds = get_catalog_bounds('frame')[catalog_ind]
+    hemisphere = get_hemisphere_from_bounds(catalog_bounds[:, 0].min(), catalog_bounds[:, 2].max())
+    frame_ids = get_global_s1_frames().frame_id.values[catalog_ind].tolist()
+    return S1Frame.from_ids(frame_ids, hemisphere=hemisphere)
 
-    if track_numbers and not df_overlapping_frames.empty:
-        ind_0 = df_overlapping_frames.track_number_min.isin(track_numbers)
-        ind_1 = df_overlapping_frames.track_number_max.isin(track_numbers)
-        ind = ind_0 | ind_1
-        df_temp = df_overlapping_frames[ind]
-        df_overlapping_frames = df_temp.reset_index(drop=True)
 
-    if df_overlapping_frames.empty:
+def get_overlapping_s1_frames(
+    geometry: Polygon,
+    track_numbers: list[int] = None,
+) -> list[S1Frame]:
+    _, catalog_ind = query_overlapping_frame_indices([geometry])
+    catalog_ind = _filter_rows_by_track_numbers(catalog_ind, track_numbers)
+
+    if not catalog_ind.size:
         msg = 'There are no overlapping frames with the AOI.'
         if track_numbers:
             track_numbers_str = list(map(str, track_numbers))
@@ -111,35 +412,55 @@ def get_overlapping_s1_frames(
             msg = msg.replace('.', f' and track number(s) {msg_track}.')
         raise ValueError(msg)
 
-    frames = gdf2frames(df_overlapping_frames)
+    frames = catalog_rows2frames(catalog_ind)
     return frames
 
 
+def get_overlapping_s1_frames_batch(
+    geometries: list[Polygon],
+    track_numbers: list[int] = None,
+) -> list[list[S1Frame]]:
+    """Get overlapping frames for many AOIs with a single query of the global spatial index.
+
+    Unlike `get_overlapping_s1_frames`, an AOI without overlapping frames yields an empty list rather than an
+    error so that a single AOI over the ocean does not invalidate the whole batch.
+
+    Parameters
+    ----------
+    geometries : list[Polygon]
+    track_numbers : list[int], optional
+
+    Returns
+    -------
+    list[list[S1Frame]]
+        Overlapping frames for each AOI in the order of `geometries`.
+    """
+    if not len(geometries):
+        return []
+    aoi_ind, catalog_ind = query_overlapping_frame_indices(geometries)
+    # The pairs are sorted by AOI so the rows of each AOI are one contiguous slice
+    catalog_ind_per_aoi = np.split(catalog_ind, np.searchsorted(aoi_ind, np.arange(1, len(geometries))))
+    return [
+        catalog_rows2frames(_filter_rows_by_track_numbers(catalog_ind_aoi, track_numbers))
+        for catalog_ind_aoi in catalog_ind_per_aoi
+    ]
+
+
 def gdf2frames(df_frames: gpd.GeoDataFrame) -> list[S1Frame]:
     xmin, _, xmax, _ = df_frames.total_bounds
-    hemisphere = None
-    if xmax - xmin > 180:
-        raise ValueError('The frames span more than 180 degrees; break apart your request')
-    if xmin <= -180:
-        hemisphere = 'west'
-    if xmax >= 180:
-        hemisphere = 'east'
-    records = df_frames.to_dict('records')
-    return [S1Frame(frame_id=r['frame_id'], hemisphere=hemisphere) for r in records]
+    hemisphere = get_hemisphere_from_bounds(xmin, xmax)
+    return S1Frame.from_ids(df_frames.frame_id.tolist(), hemisphere=hemisphere)
 
 
 def frames2gdf(s1frames: list[S1Frame], use_footprint_geometry: bool = False) -> gpd.GeoDataFrame:
-    records = [asdict(frame) for frame in s1frames]
-    geometry = [r.pop('frame_geometry') for r in records]
-    footprint_geometry = [r.pop('footprint_geometry') for r in records]
-    track_numbers = [r.pop('track_numbers') for r in records]
-    track_number_min = [min(tn) for tn in track_numbers]
-    track_number_max = [max(tn) for tn in track_numbers]
-    if use_footprint_geometry:
-        geometry = footprint_geometry
-
-    df = pd.DataFrame(records)
-    df['track_number_min'] = track_number_min
-    df['track_number_max'] = track_number_max
-    df = gpd.GeoDataFrame(df, geometry=geometry, crs=CRS.from_epsg(4326))
-    return df
+    geometry_attribute = 'footprint_geometry' if use_footprint_geometry else 'frame_geometry'
+    df = pd.DataFrame(
+        {
+            'frame_id': [frame.frame_id for frame in s1frames],
+            'hemisphere': [frame.hemisphere for frame in s1frames],
+            'track_number_min': [min(frame.track_numbers) for frame in s1frames],
+            'track_number_max': [max(frame.track_numbers) for frame in s1frames],
+        }
+    )
+    geometry = [getattr(frame, geometry_attribute) for frame in s1frames]
+    return gpd.GeoDataFrame(df, geometry=geometry, crs='EPSG:4326')
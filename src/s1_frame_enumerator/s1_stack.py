@@ -1,23 +1,58 @@
 import datetime
 import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 from warnings import warn
 
 import asf_search as asf
 import geopandas as gpd
+import numpy as np
 import pandas as pd
-from asf_search import ASFSearchResults
+import requests
+from shapely import area, intersection
 from shapely.ops import unary_union
-from tqdm import tqdm
 
 from .exceptions import StackFormationError
+from .instrumentation import StageStats, progress_bar, stage
+from .pass_footprints import PassFootprints
+from .query_cache import QueryCache, make_query_key
 from .s1_frames import S1Frame
-from .s1_stack_formatter import format_results_for_sent1_stack
+from .s1_stack_formatter import (
+    asf_results_to_table,
+    assign_repeat_passes_from_stack,
+    compact_stack_dtypes,
+    format_results_for_sent1_stack,
+    get_latest_pass_window_start,
+    is_compact_stack,
+    parse_slc_ids,
+)
+
+
+if TYPE_CHECKING:
+    from .slc_catalog import SLCQueryBackend
 
 
 MINIMUM_PER_FRAME_RATIO = 0.20
+# Number of (frame, pass) pairs described in the warning of the per frame coverage filter
+MAX_COVERAGE_WARNING_DETAILS = 10
 MIN_S1C_DATE = pd.Timestamp(
     '2025-05-19', tz='UTC'
 )  # https://sentinels.copernicus.eu/-/sentinel-1c-products-are-now-calibrated
+# Earliest acquisitions used from each platform (e.g. once calibrated); platforms not listed are not filtered
+PLATFORM_MIN_START_TIMES = {'S1C': MIN_S1C_DATE}
+
+
+class ASFSessionWithTimeout(asf.ASFSession):
+    """ASFSession that applies the same timeout (in seconds) to every HTTP request it makes."""
+
+    def __init__(self, timeout: float | None = None) -> None:
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:  # noqa: ANN401
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        return super().request(method, url, *args, **kwargs)
 
 
 def query_slc_metadata_over_frame(
@@ -26,8 +61,55 @@ def query_slc_metadata_over_frame(
     allowable_polarizations: list[str] = ['VV', 'VV+VH'],
     start_time: datetime.datetime = None,
     stop_time: datetime.datetime = None,
-) -> ASFSearchResults:
-    results = asf.geo_search(
+    timeout: float | None = None,
+    cache: QueryCache | None = None,
+    stream: bool = False,
+    session: asf.ASFSession | None = None,
+    backend: 'SLCQueryBackend | None' = None,
+) -> list[dict] | pd.DataFrame:
+    """Query the SLC metadata over a frame from ASF.
+
+    Parameters
+    ----------
+    frame : S1Frame
+    max_results_per_frame : int, optional
+    allowable_polarizations : list[str], optional
+    start_time : datetime.datetime, optional
+    stop_time : datetime.datetime, optional
+    timeout : float, optional
+        Timeout in seconds of each HTTP request
+    cache : QueryCache, optional
+        Persistent cache of query results, by default None (no caching)
+    stream : bool, optional
+        Convert each page of results into a compact table (see `asf_results_to_table`) as it arrives rather than
+        collecting every result, by default False
+    session : asf.ASFSession, optional
+        Session making the HTTP requests (e.g. one shared by many queries), by default a new session per query.
+        `timeout` only applies to the default session (use `ASFSessionWithTimeout` otherwise).
+    backend : SLCQueryBackend, optional
+        Serve the results from this backend (e.g. a `LocalSLCCatalog`) rather than ASF, by default None. Results
+        are then always a table and are not cached.
+
+    Returns
+    -------
+    list[dict] | pd.DataFrame
+        Geojson results or, if `stream` or `backend`, a table of the properties needed to format the stack
+    """
+    if backend is not None:
+        return backend.query(frame, max_results_per_frame, allowable_polarizations, start_time, stop_time)
+
+    if cache is not None:
+        key = make_query_key(
+            frame, max_results_per_frame, allowable_polarizations, start_time, stop_time, columnar=stream
+        )
+        results = cache.get(key)
+        if results is not None:
+            return results
+
+    if session is None and timeout is not None:
+        session = ASFSessionWithTimeout(timeout)
+    opts = asf.ASFSearchOptions(session=session) if session is not None else None
+    search_kwargs = dict(
         platform=[asf.PLATFORM.SENTINEL1],
         intersectsWith=frame.frame_geometry.wkt,
         maxResults=max_results_per_frame,
@@ -37,13 +119,113 @@ def query_slc_metadata_over_frame(
         processingLevel=[asf.PRODUCT_TYPE.SLC],
         start=start_time,
         end=stop_time,
+        opts=opts,
     )
-    results = [r.geojson() for r in results]
+    if stream:
+        tables = [asf_results_to_table(page) for page in asf.search_generator(**search_kwargs)]
+        results = pd.concat(tables, ignore_index=True) if tables else asf_results_to_table([])
+    else:
+        results = [r.geojson() for r in asf.geo_search(**search_kwargs)]
+    if cache is not None:
+        cache.put(key, results)
+    return results
+
+
+def query_slc_metadata_over_frames(
+    frames: list[S1Frame],
+    max_results_per_frame: int = 100_000,
+    allowable_polarizations: list[str] = ['VV', 'VV+VH'],
+    start_time: datetime.datetime = None,
+    stop_time: datetime.datetime = None,
+    timeout: float | None = None,
+    cache: QueryCache | None = None,
+    stream: bool = False,
+    max_concurrent_queries: int = 1,
+    show_progress: bool = True,
+    backend: 'SLCQueryBackend | None' = None,
+) -> list[dict] | pd.DataFrame:
+    """Query SLC metadata over each frame, optionally with a pool of threads.
+
+    Parameters
+    ----------
+    frames : list[S1Frame]
+    max_results_per_frame : int, optional
+    allowable_polarizations : list[str], optional
+    start_time : datetime.datetime, optional
+    stop_time : datetime.datetime, optional
+    timeout : float, optional
+        Timeout in seconds of each HTTP request
+    cache : QueryCache, optional
+        Persistent cache of query results, by default None (no caching)
+    stream : bool, optional
+        Convert pages of results into a compact table as they arrive, by default False
+    max_concurrent_queries : int, optional
+        Maximum number of queries in flight at once, by default 1 (serial)
+    show_progress : bool, optional
+        Show a progress bar over the frames (if tqdm is installed), by default True
+    backend : SLCQueryBackend, optional
+        Serve the results from this backend rather than ASF (see `query_slc_metadata_over_frame`)
+
+    Returns
+    -------
+    list[dict] | pd.DataFrame
+        Concatenated results in the order of `frames` regardless of the order in which the queries complete
+    """
+
+    def query(frame: S1Frame) -> list[dict]:
+        return query_slc_metadata_over_frame(
+            frame,
+            max_results_per_frame=max_results_per_frame,
+            allowable_polarizations=allowable_polarizations,
+            start_time=start_time,
+            stop_time=stop_time,
+            timeout=timeout,
+            cache=cache,
+            stream=stream,
+            backend=backend,
+        )
+
+    desc = f'Downloading stack from {len(frames)} frame geometries'
+    if max_concurrent_queries <= 1:
+        results_per_frame = [query(frame) for frame in progress_bar(frames, show=show_progress, desc=desc)]
+    else:
+        with ThreadPoolExecutor(max_workers=max_concurrent_queries) as executor:
+            results = executor.map(query, frames)
+            results_per_frame = list(progress_bar(results, show=show_progress, total=len(frames), desc=desc))
+    return concat_query_results(results_per_frame, stream=stream or backend is not None)
+
+
+def concat_query_results(results_per_frame: list[list[dict] | pd.DataFrame], stream: bool) -> list[dict] | pd.DataFrame:
+    """Concatenate the results of `query_slc_metadata_over_frame` over several frames (in order)."""
+    if stream:
+        return pd.concat(results_per_frame, ignore_index=True) if results_per_frame else asf_results_to_table([])
+    return [r for results in results_per_frame for r in results]
+
+
+def query_slc_metadata_over_frames_with_stats(
+    frames: list[S1Frame],
+    stats: StageStats | None,
+    cache: QueryCache | None = None,
+    **kwargs: Any,  # noqa: ANN401
+) -> list[dict] | pd.DataFrame:
+    """`query_slc_metadata_over_frames` recorded as the 'query' stage of `stats` (results and cache hits)."""
+    if stats is None:
+        return query_slc_metadata_over_frames(frames, cache=cache, **kwargs)
+
+    hits, misses = (cache.hits, cache.misses) if cache is not None else (0, 0)
+    with stats.stage('query'):
+        results = query_slc_metadata_over_frames(frames, cache=cache, **kwargs)
+    if cache is not None:
+        hits, misses = cache.hits - hits, cache.misses - misses
+    stats.add('query', records=len(results), cache_hits=hits, cache_misses=misses)
     return results
 
 
 def filter_s1_stack_by_geometric_coverage_per_pass(
-    df_stack: gpd.GeoDataFrame, frames: list[S1Frame], minimum_coverage_per_pass_ratio: float = 0.80
+    df_stack: gpd.GeoDataFrame,
+    frames: list[S1Frame],
+    minimum_coverage_per_pass_ratio: float = 0.80,
+    pass_footprints: PassFootprints | None = None,
 ) -> gpd.GeoDataFrame:
     """
     Ensure there is a minimum area coverage over the stack. Also ensures that SLCs within a given pass are connected.
@@ -53,13 +235,16 @@ def filter_s1_stack_by_geometric_coverage_per_pass(
     df_stack : gpd.GeoDataFrame
     frames : List[S1Frame]
     minimum_coverage_per_pass_ratio : float, optional
+    pass_footprints : PassFootprints, optional
+        Footprints of the passes of `df_stack` if already computed
 
     Returns
     -------
     gpd.GeoDataFrame
        Filtered stack
     """
-    df_stack_one_pass = df_stack.dissolve(by='repeat_pass_timestamp', aggfunc={'start_time': 'min'}, as_index=False)
+    pass_footprints = pass_footprints or PassFootprints.from_stack(df_stack)
+    df_stack_one_pass = pass_footprints.df_passes
 
     frame_geometries = [f.footprint_geometry for f in frames]
     total_frame_geometry = unary_union(frame_geometries)
@@ -84,7 +269,10 @@ def filter_s1_stack_by_geometric_coverage_per_pass(
 
 
 def filter_s1_stack_by_geometric_coverage_per_frame(
-    df_stack: gpd.GeoDataFrame, frames: list[S1Frame], minimum_coverage_ratio_per_frame: float = 0.5
+    df_stack: gpd.GeoDataFrame,
+    frames: list[S1Frame],
+    minimum_coverage_ratio_per_frame: float = 0.5,
+    pass_footprints: PassFootprints | None = None,
 ) -> gpd.GeoDataFrame:
     """Filter stack by geometric coverage per frame.
 
@@ -93,44 +281,121 @@ def filter_s1_stack_by_geometric_coverage_per_frame(
     df_stack : gpd.GeoDataFrame
     frames : List[S1Frame]
     minimum_coverage_ratio_per_frame : float, optional
+    pass_footprints : PassFootprints, optional
+        Footprints of the passes of `df_stack` if already computed
 
     Returns
     -------
     gpd.GeoDataFrame
         Filtered stack
     """
-    df_stack_one_pass = df_stack.dissolve(by='repeat_pass_timestamp', aggfunc={'start_time': 'min'}, as_index=False)
-
-    dates_with_not_enough_per_frame_coverage = []
-    for k, one_pass_series in df_stack_one_pass.iterrows():
-        for frame in frames:
-            frame_geo = frame.footprint_geometry
-            frame_intersection = frame_geo.intersection(one_pass_series['geometry'])
-            frame_coverage_ratio = frame_intersection.area / frame_geo.area
-            if frame_coverage_ratio < minimum_coverage_ratio_per_frame:
-                pass_ts = one_pass_series['repeat_pass_timestamp']
-                dates_with_not_enough_per_frame_coverage.append(pass_ts)
-                warn(
-                    f'Frame {frame.frame_id} did not have enough coverage '
-                    f'on {pass_ts.date()} (ratio of coverage was {frame_coverage_ratio:1.2f})'
-                )
-
-    dates_with_not_enough_per_frame_coverage = list(set(dates_with_not_enough_per_frame_coverage))
+    pass_footprints = pass_footprints or PassFootprints.from_stack(df_stack)
+    df_stack_one_pass = pass_footprints.df_passes
+
+    frame_geometries = np.array([frame.footprint_geometry for frame in frames], dtype=object)
+    # passes x frames
+    frame_intersections = intersection(
+        df_stack_one_pass.geometry.to_numpy()[:, np.newaxis], frame_geometries[np.newaxis, :]
+    )
+    frame_coverage_ratios = area(frame_intersections) / area(frame_geometries)
+    not_enough_coverage = frame_coverage_ratios < minimum_coverage_ratio_per_frame
+
+    if not_enough_coverage.any():
+        pass_inds, frame_inds = np.nonzero(not_enough_coverage)
+        pass_timestamps = df_stack_one_pass.repeat_pass_timestamp
+        details = [
+            f'frame {frames[j].frame_id} on {pass_timestamps.iloc[i].date()} ({frame_coverage_ratios[i, j]:1.2f})'
+            for i, j in zip(pass_inds[:MAX_COVERAGE_WARNING_DETAILS], frame_inds[:MAX_COVERAGE_WARNING_DETAILS])
+        ]
+        if pass_inds.size > MAX_COVERAGE_WARNING_DETAILS:
+            details.append(f'and {pass_inds.size - MAX_COVERAGE_WARNING_DETAILS} more')
+        warn(
+            f'{not_enough_coverage.any(axis=1).sum()} of {len(df_stack_one_pass)} passes did not have enough '
+            f'coverage (ratio below {minimum_coverage_ratio_per_frame}) over at least one frame: {"; ".join(details)}'
+        )
+
+    dates_with_not_enough_per_frame_coverage = df_stack_one_pass.repeat_pass_timestamp[not_enough_coverage.any(axis=1)]
     stack_ind = ~df_stack.repeat_pass_timestamp.isin(dates_with_not_enough_per_frame_coverage)
 
     return df_stack[stack_ind].reset_index(drop=True)
 
 
 def filter_s1c_data(df_stack: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
-    """Filter out S1C data from the stack."""
-    s1c_filter = (df_stack['slc_id'].map(lambda id_: id_[:3] == 'S1C')) & (
-        pd.to_datetime(df_stack['start_time'], utc=True) >= MIN_S1C_DATE
-    )
-    not_s1c_filter = df_stack['slc_id'].map(lambda id_: id_[:3] != 'S1C')
-    df_stack = df_stack[s1c_filter | not_s1c_filter].reset_index(drop=True)
+    """Filter out S1C data from the stack (acquired before `MIN_S1C_DATE`; see `PLATFORM_MIN_START_TIMES`)."""
+    start_time = df_stack['start_time']
+    if not isinstance(start_time.dtype, pd.DatetimeTZDtype):
+        start_time = pd.to_datetime(start_time, utc=True)
+    # The platform of every id even if other fields do not follow the naming convention
+    platform = parse_slc_ids(df_stack['slc_id'], fields=['platform'], validate=False).platform.astype(object)
+    platform_min_start_time = platform.map(PLATFORM_MIN_START_TIMES)
+    platform_filter = platform_min_start_time.isna() | (start_time >= platform_min_start_time)
+    df_stack = df_stack[platform_filter.to_numpy()].reset_index(drop=True)
     return df_stack
 
 
+def validate_stack_frames(frames: list[S1Frame]) -> None:
+    """Ensure frames form a well-posed stack i.e. contiguous and along one track (or two sequential tracks).
+
+    Raises
+    ------
+    StackFormationError
+        If the frames are (a) not connected, (b) multiple tracks (more than 2 or 2 non-sequential tracks)
+    """
+    track_numbers = [tn for f in frames for tn in f.track_numbers]
+    unique_track_numbers = list(set(list(track_numbers)))
+    n_tracks = len(unique_track_numbers)
+    if n_tracks > 1:
+        if n_tracks > 2:
+            raise StackFormationError('There are more than 2 track numbers specified')
+        if abs(unique_track_numbers[0] - unique_track_numbers[1]) > 1:
+            raise StackFormationError('There is more than 1 track number specified and these are not sequential')
+
+    frame_geometries = [f.frame_geometry for f in frames]
+    total_frame_geometry = unary_union(frame_geometries)
+    if total_frame_geometry.geom_type != 'Polygon':
+        raise StackFormationError('Frames must be contiguous')
+
+
+def filter_s1_stack_by_geometric_coverage(
+    df: gpd.GeoDataFrame,
+    frames: list[S1Frame],
+    minimum_coverage_ratio_per_pass: float = 0.80,
+    minimum_coverage_ratio_per_frame: float = 0.25,
+) -> gpd.GeoDataFrame:
+    """Apply the per pass and then the per frame coverage filters (a ratio of 0 or None skips a filter).
+
+    The footprints of the passes are computed once and shared by both filters.
+    """
+    pass_footprints = PassFootprints.from_stack(df)
+    if minimum_coverage_ratio_per_pass:
+        ratio = minimum_coverage_ratio_per_pass
+        df = filter_s1_stack_by_geometric_coverage_per_pass(
+            df, frames, minimum_coverage_per_pass_ratio=ratio, pass_footprints=pass_footprints
+        )
+        # The filter removes entire passes so their footprints are unchanged
+        pass_footprints = PassFootprints.from_stack(df, reuse=pass_footprints)
+        if df.empty:
+            warn(f'Ensuring per pass coverage of {ratio} left no available images in the stack', category=UserWarning)
+
+    if minimum_coverage_ratio_per_frame:
+        ratio = minimum_coverage_ratio_per_frame
+        df = filter_s1_stack_by_geometric_coverage_per_frame(
+            df, frames, minimum_coverage_ratio_per_frame=ratio, pass_footprints=pass_footprints
+        )
+        if df.empty:
+            warn(f'Ensuring per frame coverage of {ratio} left no available images in the stack', category=UserWarning)
+        if minimum_coverage_ratio_per_frame < MINIMUM_PER_FRAME_RATIO:
+            warn(
+                f'Requesting per frame coverage below {MINIMUM_PER_FRAME_RATIO}%; '
+                'ISCE2 requires minimum number of bursts',
+                category=UserWarning,
+            )
+    else:
+        warn('No per frame check was performed so enumeration should be done by date', category=UserWarning)
+
+    return df
+
+
 def get_s1_stack(
     frames: list[S1Frame],
     allowable_months: list[int] = None,
@@ -140,6 +405,14 @@ def get_s1_stack(
     max_query_results_per_frame: int = 100_000,
     query_start_time: datetime.datetime = None,
     query_stop_time: datetime.datetime = None,
+    max_concurrent_queries: int = 1,
+    query_timeout: float | None = None,
+    query_cache: QueryCache | None = None,
+    stream_query_results: bool = False,
+    compact_dtypes: bool = False,
+    stats: StageStats | None = None,
+    show_progress: bool = True,
+    query_backend: 'SLCQueryBackend | None' = None,
 ) -> gpd.GeoDataFrame:
     """
     Generate a stack of SLCs from a list of frames.
@@ -157,6 +430,25 @@ def get_s1_stack(
     max_query_results_per_frame : int, optional
     query_start_time : datetime.datetime, optional
     query_stop_time : datetime.datetime, optional
+    max_concurrent_queries : int, optional
+        Number of frames queried concurrently, by default 1 (serial). The stack is the same regardless.
+    query_timeout : float, optional
+        Timeout in seconds applied to each HTTP request of the query, by default None (asf_search's default)
+    query_cache : QueryCache, optional
+        Persistent cache of the per-frame queries, by default None (always query ASF)
+    stream_query_results : bool, optional
+        Convert each page of query results into a compact table as it arrives which lowers peak memory for large
+        stacks, by default False. The stack is the same regardless.
+    compact_dtypes : bool, optional
+        Return the stack with categorical, narrow integer and string dtypes (see `compact_stack_dtypes`) to reduce
+        its memory, by default False
+    stats : StageStats, optional
+        Records the time, calls and counts of the query (results and cache hits), formatting and filtering stages,
+        by default None (nothing is recorded)
+    show_progress : bool, optional
+        Show a progress bar of the queries (if tqdm is installed), by default True
+    query_backend : SLCQueryBackend, optional
+        Serve the SLC metadata from this backend, e.g. a `LocalSLCCatalog`, rather than querying ASF, by default None
 
     Returns
     -------
@@ -167,58 +459,193 @@ def get_s1_stack(
     StackFormationError
         If the frames are (a) not connected, (b) multiple tracks (more than 2 or 2 non-sequential tracks)
     """
-    track_numbers = [tn for f in frames for tn in f.track_numbers]
-    unique_track_numbers = list(set(list(track_numbers)))
-    n_tracks = len(unique_track_numbers)
-    if n_tracks > 1:
-        if n_tracks > 2:
-            raise StackFormationError('There are more than 2 track numbers specified')
-        if abs(unique_track_numbers[0] - unique_track_numbers[1]) > 1:
-            raise StackFormationError('There is more than 1 track number specified and these are not sequential')
-
-    frame_geometries = [f.frame_geometry for f in frames]
-    total_frame_geometry = unary_union(frame_geometries)
-    if total_frame_geometry.geom_type != 'Polygon':
-        raise StackFormationError('Frames must be contiguous')
+    validate_stack_frames(frames)
 
-    n = len(frame_geometries)
-    results = []
     # Breaking apart the frame geometries takes longer, but ensures we get all the results
     # since asf_search may not get all the images if the geometry is too large
-    for frame in tqdm(frames, desc=f'Downloading stack from {n} frame geometries'):
-        results += query_slc_metadata_over_frame(
-            frame,
-            max_results_per_frame=max_query_results_per_frame,
-            allowable_polarizations=allowable_polarizations,
-            start_time=query_start_time,
-            stop_time=query_stop_time,
-        )
+    results = query_slc_metadata_over_frames_with_stats(
+        frames,
+        stats,
+        max_concurrent_queries=max_concurrent_queries,
+        max_results_per_frame=max_query_results_per_frame,
+        allowable_polarizations=allowable_polarizations,
+        start_time=query_start_time,
+        stop_time=query_stop_time,
+        timeout=query_timeout,
+        cache=query_cache,
+        stream=stream_query_results,
+        show_progress=show_progress,
+        backend=query_backend,
+    )
 
-    df = format_results_for_sent1_stack(results, allowable_months=allowable_months)
-    df = filter_s1c_data(df)
+    return format_and_filter_stack(
+        results,
+        frames,
+        allowable_months=allowable_months,
+        minimum_coverage_ratio_per_pass=minimum_coverage_ratio_per_pass,
+        minimum_coverage_ratio_per_frame=minimum_coverage_ratio_per_frame,
+        compact_dtypes=compact_dtypes,
+        stats=stats,
+    )
+
+
+def format_and_filter_stack(
+    results: list[dict] | pd.DataFrame,
+    frames: list[S1Frame],
+    allowable_months: list[int] = None,
+    minimum_coverage_ratio_per_pass: float = 0.80,
+    minimum_coverage_ratio_per_frame: float = 0.25,
+    compact_dtypes: bool = False,
+    stats: StageStats | None = None,
+) -> gpd.GeoDataFrame:
+    """Stack of `get_s1_stack` from the results of the queries over its frames (see `get_s1_stack` for parameters)."""
+    with stage(stats, 'format'):
+        df = format_results_for_sent1_stack(results, allowable_months=allowable_months)
+        df = filter_s1c_data(df)
+    if stats is not None:
+        stats.add('format', records=len(df))
 
     if df.empty:
         warn('There were no results returned', category=UserWarning)
         return df
 
-    if minimum_coverage_ratio_per_pass:
-        ratio = minimum_coverage_ratio_per_pass
-        df = filter_s1_stack_by_geometric_coverage_per_pass(df, frames, minimum_coverage_per_pass_ratio=ratio)
-        if df.empty:
-            warn(f'Ensuring per pass coverage of {ratio} left no available images in the stack', category=UserWarning)
+    with stage(stats, 'coverage_filters'):
+        df = filter_s1_stack_by_geometric_coverage(
+            df,
+            frames,
+            minimum_coverage_ratio_per_pass=minimum_coverage_ratio_per_pass,
+            minimum_coverage_ratio_per_frame=minimum_coverage_ratio_per_frame,
+        )
+    if stats is not None:
+        stats.add('coverage_filters', records=len(df))
+    if compact_dtypes:
+        with stage(stats, 'compact_dtypes'):
+            df = compact_stack_dtypes(df)
+    return df
 
-    if minimum_coverage_ratio_per_frame:
-        ratio = minimum_coverage_ratio_per_frame
-        df = filter_s1_stack_by_geometric_coverage_per_frame(df, frames, minimum_coverage_ratio_per_frame=ratio)
-        if df.empty:
-            warn(f'Ensuring per frame coverage of {ratio} left no available images in the stack', category=UserWarning)
-        if minimum_coverage_ratio_per_frame < MINIMUM_PER_FRAME_RATIO:
-            warn(
-                f'Requesting per frame coverage below {MINIMUM_PER_FRAME_RATIO}%; '
-                'ISCE2 requires minimum number of bursts',
-                category=UserWarning,
-            )
-    else:
-        warn('No per frame check was performed so enumeration should be done by date', category=UserWarning)
 
+def update_s1_stack(
+    df_stack: gpd.GeoDataFrame,
+    frames: list[S1Frame],
+    allowable_months: list[int] = None,
+    allowable_polarizations: list[str] = ['VV', 'VV+VH'],
+    minimum_coverage_ratio_per_pass: float = 0.80,
+    minimum_coverage_ratio_per_frame: float = 0.25,
+    max_query_results_per_frame: int = 100_000,
+    query_stop_time: datetime.datetime = None,
+    max_concurrent_queries: int = 1,
+    query_timeout: float | None = None,
+    query_cache: QueryCache | None = None,
+    stream_query_results: bool = False,
+    compact_dtypes: bool | None = None,
+    stats: StageStats | None = None,
+    show_progress: bool = True,
+    query_backend: 'SLCQueryBackend | None' = None,
+) -> gpd.GeoDataFrame:
+    """
+    Refresh a stack generated by `get_s1_stack` with acquisitions since its latest acquisition.
+
+    Only acquisitions starting at or after the start of the window of the latest pass of the stack are queried (so
+    SLCs of that pass published late are included; see `get_latest_pass_window_start`); SLCs already in the stack
+    are ignored. New SLCs either
+    join the latest pass of the stack or form new passes numbered after the existing ones (see
+    `assign_repeat_passes_from_stack`). The coverage filters are only re-run over passes that received new SLCs;
+    all other rows of the stack are returned unchanged.
+
+    Parameters
+    ----------
+    df_stack : gpd.GeoDataFrame
+        Stack previously generated by `get_s1_stack` over `frames` with the same parameters
+    frames : List[S1Frame]
+    allowable_months : List[int], optional
+    allowable_polarizations : List[str], optional
+    minimum_coverage_ratio_per_pass : float, optional
+    minimum_coverage_ratio_per_frame : float, optional
+    max_query_results_per_frame : int, optional
+    query_stop_time : datetime.datetime, optional
+    max_concurrent_queries : int, optional
+    query_timeout : float, optional
+    query_cache : QueryCache, optional
+    stream_query_results : bool, optional
+    compact_dtypes : bool, optional
+        By default (None) the updated stack has compact dtypes if `df_stack` does
+    stats : StageStats, optional
+    show_progress : bool, optional
+    query_backend : SLCQueryBackend, optional
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Updated stack sorted as in `get_s1_stack`
+
+    Raises
+    ------
+    StackFormationError
+        If the frames are (a) not connected, (b) multiple tracks (more than 2 or 2 non-sequential tracks)
+    """
+    stack_kwargs = dict(
+        allowable_months=allowable_months,
+        allowable_polarizations=allowable_polarizations,
+        minimum_coverage_ratio_per_pass=minimum_coverage_ratio_per_pass,
+        minimum_coverage_ratio_per_frame=minimum_coverage_ratio_per_frame,
+        max_query_results_per_frame=max_query_results_per_frame,
+        query_stop_time=query_stop_time,
+        max_concurrent_queries=max_concurrent_queries,
+        query_timeout=query_timeout,
+        query_cache=query_cache,
+        stream_query_results=stream_query_results,
+        stats=stats,
+        show_progress=show_progress,
+        query_backend=query_backend,
+    )
+    if compact_dtypes is None:
+        compact_dtypes = is_compact_stack(df_stack)
+    if df_stack.empty:
+        return get_s1_stack(frames, compact_dtypes=compact_dtypes, **stack_kwargs)
+
+    validate_stack_frames(frames)
+    # SLCs of the latest pass can be published after others of the pass that were acquired later, so the whole pass
+    # is queried again (the SLCs already in the stack are dropped below)
+    query_start_time = get_latest_pass_window_start(df_stack)
+    results = query_slc_metadata_over_frames_with_stats(
+        frames,
+        stats,
+        max_concurrent_queries=max_concurrent_queries,
+        max_results_per_frame=max_query_results_per_frame,
+        allowable_polarizations=allowable_polarizations,
+        start_time=query_start_time,
+        stop_time=query_stop_time,
+        timeout=query_timeout,
+        cache=query_cache,
+        stream=stream_query_results,
+        show_progress=show_progress,
+        backend=query_backend,
+    )
+    with stage(stats, 'format'):
+        df_new = format_results_for_sent1_stack(results, allowable_months=allowable_months)
+        df_new = filter_s1c_data(df_new)
+        df_new = df_new[~df_new.slc_id.isin(df_stack.slc_id)].reset_index(drop=True)
+    if stats is not None:
+        stats.add('format', records=len(df_new))
+    if df_new.empty:
+        return compact_stack_dtypes(df_stack) if compact_dtypes else df_stack
+
+    df_new = assign_repeat_passes_from_stack(df_new, df_stack)
+    changed_pass_ids = df_new.stack_repeat_pass_id.unique()
+    ind_changed = df_stack.stack_repeat_pass_id.isin(changed_pass_ids)
+    df_changed = pd.concat([df_stack[ind_changed], df_new], ignore_index=True)
+    with stage(stats, 'coverage_filters'):
+        df_changed = filter_s1_stack_by_geometric_coverage(
+            df_changed,
+            frames,
+            minimum_coverage_ratio_per_pass=minimum_coverage_ratio_per_pass,
+            minimum_coverage_ratio_per_frame=minimum_coverage_ratio_per_frame,
+        )
+    if stats is not None:
+        stats.add('coverage_filters', records=len(df_changed))
+
+    df = pd.concat([df_stack[~ind_changed], df_changed], ignore_index=True)
+    df = df.sort_values(by=['start_time', 'track_number']).reset_index(drop=True)
+    if compact_dtypes:
+        df = compact_stack_dtypes(df)
     return df
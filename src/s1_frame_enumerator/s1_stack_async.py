@@ -0,0 +1,181 @@
+import asyncio
+import datetime
+from contextlib import nullcontext
+from typing import TYPE_CHECKING
+
+import asf_search as asf
+import geopandas as gpd
+import pandas as pd
+
+from .instrumentation import StageStats, stage
+from .query_cache import QueryCache
+from .s1_frames import S1Frame
+from .s1_stack import (
+    ASFSessionWithTimeout,
+    concat_query_results,
+    format_and_filter_stack,
+    query_slc_metadata_over_frame,
+    validate_stack_frames,
+)
+
+
+if TYPE_CHECKING:
+    from .slc_catalog import SLCQueryBackend
+
+
+async def aquery_slc_metadata_over_frame(
+    frame: S1Frame,
+    max_results_per_frame: int = 100_000,
+    allowable_polarizations: list[str] = ['VV', 'VV+VH'],
+    start_time: datetime.datetime = None,
+    stop_time: datetime.datetime = None,
+    timeout: float | None = None,
+    cache: QueryCache | None = None,
+    stream: bool = False,
+    session: asf.ASFSession | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    backend: 'SLCQueryBackend | None' = None,
+) -> list[dict] | pd.DataFrame:
+    """Query the SLC metadata over a frame from ASF without blocking the event loop.
+
+    asf_search only makes blocking requests so `query_slc_metadata_over_frame` runs in a thread of the default
+    executor (see `asyncio.to_thread`) once `semaphore` is acquired.
+
+    Parameters
+    ----------
+    frame : S1Frame
+    max_results_per_frame : int, optional
+    allowable_polarizations : list[str], optional
+    start_time : datetime.datetime, optional
+    stop_time : datetime.datetime, optional
+    timeout : float, optional
+        Timeout in seconds of each HTTP request (if no `session` is given)
+    cache : QueryCache, optional
+    stream : bool, optional
+    session : asf.ASFSession, optional
+        Session shared with other queries, by default a new session for this query
+    semaphore : asyncio.Semaphore, optional
+        Bounds the number of queries in flight, e.g. across all the stacks of a service, by default unbounded
+    backend : SLCQueryBackend, optional
+        Serve the results from this backend rather than ASF
+
+    Returns
+    -------
+    list[dict] | pd.DataFrame
+        Same as `query_slc_metadata_over_frame`
+    """
+    async with semaphore if semaphore is not None else nullcontext():
+        return await asyncio.to_thread(
+            query_slc_metadata_over_frame,
+            frame,
+            max_results_per_frame=max_results_per_frame,
+            allowable_polarizations=allowable_polarizations,
+            start_time=start_time,
+            stop_time=stop_time,
+            timeout=timeout,
+            cache=cache,
+            stream=stream,
+            session=session,
+            backend=backend,
+        )
+
+
+async def aget_s1_stack(
+    frames: list[S1Frame],
+    allowable_months: list[int] = None,
+    allowable_polarizations: list[str] = ['VV', 'VV+VH'],
+    minimum_coverage_ratio_per_pass: float = 0.80,
+    minimum_coverage_ratio_per_frame: float = 0.25,
+    max_query_results_per_frame: int = 100_000,
+    query_start_time: datetime.datetime = None,
+    query_stop_time: datetime.datetime = None,
+    max_concurrent_queries: int = 1,
+    query_timeout: float | None = None,
+    query_cache: QueryCache | None = None,
+    stream_query_results: bool = False,
+    compact_dtypes: bool = False,
+    stats: StageStats | None = None,
+    session: asf.ASFSession | None = None,
+    semaphore: asyncio.Semaphore | None = None,
+    query_backend: 'SLCQueryBackend | None' = None,
+) -> gpd.GeoDataFrame:
+    """Asynchronous `get_s1_stack`; the stack is the same.
+
+    The frames are queried concurrently with `aquery_slc_metadata_over_frame` using one session and the stack is
+    then formatted and filtered in a thread (see `format_and_filter_stack`) so the event loop is never blocked.
+
+    Parameters
+    ----------
+    frames : List[S1Frame]
+    allowable_months : List[int], optional
+    allowable_polarizations : List[str], optional
+    minimum_coverage_ratio_per_pass : float, optional
+    minimum_coverage_ratio_per_frame : float, optional
+    max_query_results_per_frame : int, optional
+    query_start_time : datetime.datetime, optional
+    query_stop_time : datetime.datetime, optional
+    max_concurrent_queries : int, optional
+        Number of frames queried concurrently if no `semaphore` is given, by default 1
+    query_timeout : float, optional
+        Timeout in seconds of each HTTP request if no `session` is given
+    query_cache : QueryCache, optional
+    stream_query_results : bool, optional
+    compact_dtypes : bool, optional
+    stats : StageStats, optional
+        Should not be shared by calls running concurrently
+    session : asf.ASFSession, optional
+        Session shared by the queries (and e.g. other stacks), by default one `ASFSessionWithTimeout` per call
+    semaphore : asyncio.Semaphore, optional
+        Bounds the number of queries in flight across every call sharing it, by default `max_concurrent_queries`
+        for this call
+    query_backend : SLCQueryBackend, optional
+        Serve the SLC metadata from this backend, e.g. a `LocalSLCCatalog`, rather than querying ASF
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+
+    Raises
+    ------
+    StackFormationError
+        If the frames are (a) not connected, (b) multiple tracks (more than 2 or 2 non-sequential tracks)
+    """
+    validate_stack_frames(frames)
+    session = session if session is not None else ASFSessionWithTimeout(query_timeout)
+    semaphore = semaphore if semaphore is not None else asyncio.Semaphore(max_concurrent_queries)
+
+    cache_hits, cache_misses = (query_cache.hits, query_cache.misses) if query_cache is not None else (0, 0)
+    with stage(stats, 'query'):
+        results_per_frame = await asyncio.gather(
+            *(
+                aquery_slc_metadata_over_frame(
+                    frame,
+                    max_results_per_frame=max_query_results_per_frame,
+                    allowable_polarizations=allowable_polarizations,
+                    start_time=query_start_time,
+                    stop_time=query_stop_time,
+                    cache=query_cache,
+                    stream=stream_query_results,
+                    session=session,
+                    semaphore=semaphore,
+                    backend=query_backend,
+                )
+                for frame in frames
+            )
+        )
+    results = concat_query_results(results_per_frame, stream=stream_query_results or query_backend is not None)
+    if stats is not None:
+        if query_cache is not None:
+            cache_hits, cache_misses = query_cache.hits - cache_hits, query_cache.misses - cache_misses
+        stats.add('query', records=len(results), cache_hits=cache_hits, cache_misses=cache_misses)
+
+    return await asyncio.to_thread(
+        format_and_filter_stack,
+        results,
+        frames,
+        allowable_months=allowable_months,
+        minimum_coverage_ratio_per_pass=minimum_coverage_ratio_per_pass,
+        minimum_coverage_ratio_per_frame=minimum_coverage_ratio_per_frame,
+        compact_dtypes=compact_dtypes,
+        stats=stats,
+    )
@@ -1,6 +1,9 @@
+from collections.abc import Iterable
+from typing import Any
+
 import geopandas as gpd
 import pandas as pd
-from rasterio.crs import CRS
+from shapely import from_wkb, to_wkb
 from shapely.geometry import shape
 
 
@@ -21,18 +24,174 @@ S1_COLUMNS = [
 ]
 
 
-def format_results_for_sent1_stack(geojson_results: list[dict], allowable_months: list[int] = None) -> gpd.GeoDataFrame:
-    geometry = [shape(r['geometry']) for r in geojson_results]
-    data = [r['properties'] for r in geojson_results]
+# The ASF search properties needed to format a stack
+ASF_PROPERTIES = [
+    'fileID',
+    'startTime',
+    'stopTime',
+    'url',
+    'pathNumber',
+    'orbit',
+    'polarization',
+    'beamModeType',
+    'bytes',
+    'flightDirection',
+]
+
+REPEAT_PASS_BIN = pd.Timedelta(days=5)
+
+# Fields of Sentinel-1 SLC ids e.g. S1A_IW_SLC__1SDV_20161221T173720_20161221T173747_003497_005FA6_A1A2
+SLC_ID_PATTERN = (
+    r'^(?P<platform>S1[A-D])_(?P<beam_mode>[A-Z0-9]{2})_(?P<product_type>[A-Z]{3})_'
+    r'_(?P<processing_level>\d)(?P<product_class>[A-Z])(?P<polarization_code>[A-Z]{2})_'
+    r'(?P<start_time>\d{8}T\d{6})_(?P<stop_time>\d{8}T\d{6})_(?P<absolute_orbit>\d{6})_'
+    r'(?P<datatake_id>[0-9A-F]{6})_(?P<product_id>[0-9A-F]{4})$'
+)
+# Positions of the fields of `SLC_ID_PATTERN` (the ids are fixed width)
+SLC_ID_FIELDS = {
+    'platform': slice(0, 3),
+    'beam_mode': slice(4, 6),
+    'product_type': slice(7, 10),
+    'processing_level': slice(12, 13),
+    'product_class': slice(13, 14),
+    'polarization_code': slice(14, 16),
+    'start_time': slice(17, 32),
+    'stop_time': slice(33, 48),
+    'absolute_orbit': slice(49, 55),
+    'datatake_id': slice(56, 62),
+    'product_id': slice(63, 67),
+}
+
+# Narrow integers and categoricals (for the few distinct values) of `compact_stack_dtypes`
+COMPACT_S1_DTYPES = {
+    'track_number': 'int16',
+    'orbit': 'int32',
+    'stack_repeat_pass_id': 'int32',
+    'polarization': 'category',
+    'beam_mode': 'category',
+    'flight_direction': 'category',
+}
+
+
+def asf_results_to_table(results: Iterable[Any]) -> pd.DataFrame:
+    """Convert ASF search results to a compact table of the `ASF_PROPERTIES` and WKB geometries.
+
+    Parameters
+    ----------
+    results : Iterable
+        Either geojson dictionaries (as returned by `ASFProduct.geojson()`) or `ASFProduct`s e.g. a page of results
+        from `asf_search.search_generator`
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per result with the `ASF_PROPERTIES` columns and a `geometry` column of WKB bytes
+    """
+    properties, geometries = [], []
+    for r in results:
+        if isinstance(r, dict):
+            properties.append(r['properties'])
+            geometries.append(r['geometry'])
+        else:
+            properties.append(r.properties)
+            geometries.append(r.geometry)
+    table = pd.DataFrame({prop: [p.get(prop) for p in properties] for prop in ASF_PROPERTIES})
+    table['geometry'] = to_wkb([shape(geo) for geo in geometries]) if geometries else []
+    return table
+
+
+def parse_slc_ids(slc_id: pd.Series, fields: list[str] | None = None, validate: bool = True) -> pd.DataFrame:
+    """Parse the fields of SLC ids (see `SLC_ID_PATTERN`) with vectorized string operations.
+
+    Parameters
+    ----------
+    slc_id : pd.Series
+        SLC ids e.g. the `slc_id` column of a stack
+    fields : list[str], optional
+        Only parse these fields (keys of `SLC_ID_FIELDS`), by default all of them
+    validate : bool, optional
+        Whether ids not following the naming convention have missing fields, by default True. Otherwise the fields
+        are taken from their positions in every id e.g. the platform is the first 3 characters.
+
+    Returns
+    -------
+    pd.DataFrame
+        Same index as `slc_id` with categorical platform, beam mode, product type, processing level, product class and
+        polarization code; UTC start/stop times; integer absolute orbit and string datatake/product ids. Ids not
+        following the naming convention have missing fields (if `validate`).
+    """
+    slc_id = slc_id.astype(pd.StringDtype())
+    if validate:
+        # Matching the pattern is much faster than extracting its groups; the fields are then sliced
+        slc_id = slc_id.where(slc_id.str.fullmatch(SLC_ID_PATTERN).fillna(False))
+
+    df_fields = pd.DataFrame(index=slc_id.index)
+    for field in fields or SLC_ID_FIELDS:
+        field_slice = SLC_ID_FIELDS[field]
+        values = slc_id.str.slice(field_slice.start, field_slice.stop)
+        if field in ['start_time', 'stop_time']:
+            values = pd.to_datetime(values, format='%Y%m%dT%H%M%S', utc=True)
+        elif field == 'absolute_orbit':
+            values = values.astype('Int32')
+        elif field not in ['datatake_id', 'product_id']:
+            values = values.astype('category')
+        df_fields[field] = values
+    return df_fields
+
+
+def get_repeat_pass_timestamps(start_time: pd.Series, stack_repeat_pass_id: pd.Series) -> pd.Series:
+    """Earliest date (as a UTC timestamp) of the acquisitions in each repeat pass broadcast to every acquisition."""
+    # Only the (few) passes are converted to dates; we want the UTC date - however timestamps are serializable
+    # (dates are currently not)
+    pass_start_time = start_time.groupby(stack_repeat_pass_id).min()
+    pass_timestamp = pd.to_datetime(pass_start_time.dt.date).dt.tz_localize('UTC')
+    return stack_repeat_pass_id.map(pass_timestamp)
 
-    df_asf = pd.DataFrame(data)
-    df_asf = gpd.GeoDataFrame(df_asf, geometry=geometry, crs=CRS.from_epsg(4326))
 
-    df_formatted = gpd.GeoDataFrame(columns=S1_COLUMNS, geometry=[], crs=CRS.from_epsg(4326))
+def compact_stack_dtypes(df_stack: gpd.GeoDataFrame, string_dtype: bool = True) -> gpd.GeoDataFrame:
+    """Cast the columns of a stack to compact dtypes (see `COMPACT_S1_DTYPES`).
+
+    Parameters
+    ----------
+    df_stack : gpd.GeoDataFrame
+        Stack from `format_results_for_sent1_stack` or `get_s1_stack`
+    string_dtype : bool, optional
+        Also store `slc_id` and `url` with pandas' string dtype (Arrow backed when pyarrow is installed) rather than
+        python objects, by default True
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Copy of the stack with the same values
+    """
+    dtypes = dict(COMPACT_S1_DTYPES)
+    if string_dtype:
+        dtypes.update({'slc_id': pd.StringDtype(), 'url': pd.StringDtype()})
+    return df_stack.astype({column: dtype for (column, dtype) in dtypes.items() if column in df_stack.columns})
+
+
+def is_compact_stack(df_stack: gpd.GeoDataFrame) -> bool:
+    """Whether the stack was cast with `compact_stack_dtypes`."""
+    return isinstance(df_stack.dtypes.get('polarization'), pd.CategoricalDtype)
+
+
+def format_results_for_sent1_stack(
+    geojson_results: list[dict] | pd.DataFrame, allowable_months: list[int] = None
+) -> gpd.GeoDataFrame:
+    if isinstance(geojson_results, pd.DataFrame):
+        # Table from `asf_results_to_table`
+        geometry = from_wkb(geojson_results['geometry'].to_numpy())
+        df_asf = geojson_results.drop(columns='geometry')
+    else:
+        geometry = [shape(r['geometry']) for r in geojson_results]
+        df_asf = pd.DataFrame([r['properties'] for r in geojson_results])
+    df_asf = gpd.GeoDataFrame(df_asf, geometry=geometry, crs='EPSG:4326')
+
+    df_formatted = gpd.GeoDataFrame(columns=S1_COLUMNS, geometry=[], crs='EPSG:4326')
     if df_asf.empty:
         return df_formatted
 
-    df_formatted['slc_id'] = df_asf['fileID'].map(lambda file_id: file_id.replace('-SLC', ''))
+    df_formatted['slc_id'] = df_asf['fileID'].str.replace('-SLC', '', regex=False)
     df_formatted['start_time'] = pd.to_datetime(df_asf.startTime)
     df_formatted['stop_time'] = pd.to_datetime(df_asf.stopTime)
     df_formatted['url'] = df_asf['url']
@@ -51,25 +210,69 @@ def format_results_for_sent1_stack(geojson_results: list[dict], allowable_months
     if allowable_months:
         ind_month = df_formatted.start_time.dt.month.isin(allowable_months)
         df_formatted = df_formatted[ind_month].reset_index(drop=True)
+        if df_formatted.empty:
+            return df_formatted
 
     # Want to group S1 imagery by repeat pass date - technically this could be at midnight so we do some work.
-    # First we get ids based on julian date, then we group by first date in group
-    julian_dates = df_formatted.start_time.map(lambda dt: dt.to_julian_date())
+    # First we get ids based on the days elapsed since the first acquisition, then we group by first date in group
     # Note this calculus depends on the repeat pass frequency of Sentinel-1 which is 6
-    df_formatted['stack_repeat_pass_id'] = ((julian_dates - julian_dates[0]) // 5).astype(int)
-    # Ensure sequential (see: https://stackoverflow.com/a/15074395)
-    df_formatted['stack_repeat_pass_id'] = df_formatted.groupby(['stack_repeat_pass_id']).ngroup()
-
-    df_temp = pd.DataFrame(columns=['stack_repeat_pass_id', 'repeat_pass_timestamp'])
-    df_temp['stack_repeat_pass_id'] = df_formatted.stack_repeat_pass_id
-    # We want the UTC date - however timestamps are serializable (dates are currently not)
-    df_temp['repeat_pass_timestamp'] = pd.to_datetime(df_formatted.start_time.dt.date)
-    # Requires UTC timzone
-    df_temp.repeat_pass_timestamp = df_temp.repeat_pass_timestamp.map(lambda ts: ts.tz_localize('UTC'))
+    pass_bin = (df_formatted.start_time - df_formatted.start_time.iloc[0]) // REPEAT_PASS_BIN
+    # Ensure sequential
+    df_formatted['stack_repeat_pass_id'] = pass_bin.groupby(pass_bin).ngroup()
     # Get the min date in group
-    df_repeat_pass_timestamp = df_temp.groupby('stack_repeat_pass_id').min()
-    # look up min date based on group
-    repeat_pass_dict = df_repeat_pass_timestamp.to_dict()['repeat_pass_timestamp']
-    df_formatted['repeat_pass_timestamp'] = df_formatted.stack_repeat_pass_id.map(lambda rp_id: repeat_pass_dict[rp_id])
+    df_formatted['repeat_pass_timestamp'] = get_repeat_pass_timestamps(
+        df_formatted.start_time, df_formatted.stack_repeat_pass_id
+    )
 
     return df_formatted
+
+
+def get_latest_pass_window_start(df_stack: gpd.GeoDataFrame) -> pd.Timestamp:
+    """Start of the 5 day window of the latest pass of a stack (see `assign_repeat_passes_from_stack`).
+
+    Every acquisition of the latest pass starts at or after it, including those not (yet) in the stack.
+    """
+    stack_start_time = df_stack.start_time.min()
+    latest_pass_bin = (df_stack.start_time.max() - stack_start_time) // REPEAT_PASS_BIN
+    return stack_start_time + latest_pass_bin * REPEAT_PASS_BIN
+
+
+def assign_repeat_passes_from_stack(df_new: gpd.GeoDataFrame, df_stack: gpd.GeoDataFrame) -> gpd.GeoDataFrame:
+    """Assign `stack_repeat_pass_id` and `repeat_pass_timestamp` to acquisitions that follow an existing stack.
+
+    Acquisitions are binned into 5 day windows anchored at the first acquisition of `df_stack` exactly as in
+    `format_results_for_sent1_stack`. Those in the bin of the latest pass of `df_stack` join that pass (with its
+    id and timestamp) and later bins are numbered sequentially after the existing passes. Hence, the ids agree with
+    formatting the whole archive at once as long as the first acquisition of the stack was not filtered out.
+
+    Parameters
+    ----------
+    df_new : gpd.GeoDataFrame
+        Formatted acquisitions not in `df_stack` and acquired no earlier than its latest pass
+    df_stack : gpd.GeoDataFrame
+        Existing (non-empty) stack
+
+    Returns
+    -------
+    gpd.GeoDataFrame
+        Copy of `df_new` with the repeat pass columns consistent with `df_stack`
+    """
+    df_new = df_new.copy()
+    stack_start_time = df_stack.start_time.min()
+    latest_pass_id = int(df_stack.stack_repeat_pass_id.max())
+    ind_latest_pass = df_stack.stack_repeat_pass_id == latest_pass_id
+    latest_pass_bin = (df_stack.start_time[ind_latest_pass].max() - stack_start_time) // REPEAT_PASS_BIN
+    latest_pass_timestamp = df_stack.repeat_pass_timestamp[ind_latest_pass].iloc[0]
+
+    pass_bin = ((df_new.start_time - stack_start_time) // REPEAT_PASS_BIN).clip(lower=latest_pass_bin)
+    in_latest_pass = pass_bin == latest_pass_bin
+    new_pass_id = latest_pass_id + pass_bin[~in_latest_pass].rank(method='dense').astype(int)
+
+    df_new['stack_repeat_pass_id'] = latest_pass_id
+    df_new.loc[~in_latest_pass, 'stack_repeat_pass_id'] = new_pass_id
+    df_new['stack_repeat_pass_id'] = df_new['stack_repeat_pass_id'].astype(int)
+
+    repeat_pass_timestamp = get_repeat_pass_timestamps(df_new.start_time, df_new.stack_repeat_pass_id)
+    repeat_pass_timestamp[in_latest_pass] = latest_pass_timestamp
+    df_new['repeat_pass_timestamp'] = repeat_pass_timestamp
+    return df_new
@@ -0,0 +1,273 @@
+import argparse
+import datetime
+import uuid
+from collections.abc import Iterable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Protocol
+
+import asf_search as asf
+import geopandas as gpd
+import pandas as pd
+from shapely import from_wkb, intersects
+from shapely.geometry.base import BaseGeometry
+
+from .s1_frames import S1Frame
+from .s1_stack_formatter import ASF_PROPERTIES, asf_results_to_table, get_latest_pass_window_start
+
+
+if TYPE_CHECKING:
+    import pyarrow.dataset as ds
+
+
+# Types of the properties stored in the catalog so that every file of a track has the same schema
+CATALOG_DTYPES = {'pathNumber': 'int64', 'orbit': 'int64', 'bytes': 'float64'}
+
+
+class SLCQueryBackend(Protocol):
+    """Source of the SLC metadata over a frame used instead of ASF by `query_slc_metadata_over_frame(backend=...)`.
+
+    `query` returns a table as `asf_results_to_table` of the SLCs (IW beam mode) over the frame along its tracks.
+    """
+
+    def query(
+        self,
+        frame: S1Frame,
+        max_results_per_frame: int,
+        allowable_polarizations: list[str],
+        start_time: datetime.datetime | str | None,
+        stop_time: datetime.datetime | str | None,
+    ) -> pd.DataFrame: ...
+
+
+def to_utc_timestamp(t: datetime.datetime | str) -> pd.Timestamp:
+    t = pd.Timestamp(t)
+    return t.tz_localize('UTC') if t.tz is None else t.tz_convert('UTC')
+
+
+class LocalSLCCatalog:
+    """SLC metadata harvested from ASF (see `harvest_slc_metadata`) stored locally as GeoParquet partitioned by track.
+
+    Each track is a directory `track_number=<track>` of GeoParquet files with the `ASF_PROPERTIES`, the footprints,
+    their bounding boxes (a `bbox` covering column) and the `start_time` of each SLC. Queries over a frame only read
+    the directories of its tracks and the row groups whose bounding boxes and times can match before testing the
+    footprints against the frame. Appending writes new files; SLCs stored more than once are returned once (see
+    `compact` to rewrite a track without duplicates). Reading or writing a catalog requires pyarrow
+    (`pip install s1_frame_enumerator[catalog]`).
+
+    Parameters
+    ----------
+    path : Path | str
+        Directory of the catalog (created when data is first appended)
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({str(self.path)!r})'
+
+    def track_path(self, track_number: int) -> Path:
+        return self.path / f'track_number={int(track_number)}'
+
+    @property
+    def track_numbers(self) -> list[int]:
+        paths = self.path.glob('track_number=*') if self.path.exists() else []
+        return sorted(int(p.name.split('=')[1]) for p in paths if any(p.glob('*.parquet')))
+
+    def append(self, results: Iterable[Any] | pd.DataFrame) -> int:
+        """Add ASF results (geojson, `ASFProduct`s or a table from `asf_results_to_table`); returns the count added."""
+        table = results if isinstance(results, pd.DataFrame) else asf_results_to_table(results)
+        if table.empty:
+            return 0
+        df = gpd.GeoDataFrame(
+            table[ASF_PROPERTIES].astype(CATALOG_DTYPES),
+            geometry=from_wkb(table['geometry'].to_numpy()),
+            crs='EPSG:4326',
+        )
+        df['start_time'] = pd.to_datetime(df['startTime'], utc=True)
+        for track_number, df_track in df.groupby('pathNumber'):
+            self._write(track_number, df_track)
+        return len(df)
+
+    def _write(self, track_number: int, df_track: gpd.GeoDataFrame) -> None:
+        track_path = self.track_path(track_number)
+        track_path.mkdir(parents=True, exist_ok=True)
+        df_track = df_track.sort_values(by='start_time')
+        df_track.to_parquet(track_path / f'{uuid.uuid4().hex}.parquet', index=False, write_covering_bbox=True)
+
+    def _dataset(self, track_numbers: list[int]) -> 'ds.Dataset | None':
+        import pyarrow.dataset as ds
+
+        available_track_numbers = self.track_numbers
+        datasets = [
+            ds.dataset(self.track_path(tn), format='parquet') for tn in track_numbers if tn in available_track_numbers
+        ]
+        if not datasets:
+            return None
+        return ds.dataset(datasets) if len(datasets) > 1 else datasets[0]
+
+    def latest_start_time(self, track_number: int) -> pd.Timestamp | None:
+        import pyarrow.compute as pc
+
+        dataset = self._dataset([track_number])
+        if dataset is None:
+            return None
+        start_time = dataset.to_table(columns=['start_time']).column('start_time')
+        return pd.Timestamp(pc.max(start_time).as_py())
+
+    def latest_pass_window_start(self, track_number: int) -> pd.Timestamp | None:
+        """Start of the window of the latest pass of a track (see `get_latest_pass_window_start`) or None if empty."""
+        dataset = self._dataset([track_number])
+        if dataset is None:
+            return None
+        start_time = dataset.to_table(columns=['start_time']).column('start_time').to_pandas()
+        return get_latest_pass_window_start(pd.DataFrame({'start_time': start_time}))
+
+    def file_ids(self, track_number: int, start_time: datetime.datetime | str | None = None) -> set[str]:
+        """`fileID`s of the SLCs of a track (starting at or after `start_time`, UTC if not timezone aware)."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        dataset = self._dataset([track_number])
+        if dataset is None:
+            return set()
+        expression = ds.field('start_time') >= pa.scalar(to_utc_timestamp(start_time)) if start_time else None
+        return set(dataset.to_table(columns=['fileID'], filter=expression).column('fileID').to_pylist())
+
+    def query(
+        self,
+        frame: S1Frame,
+        max_results_per_frame: int = 100_000,
+        allowable_polarizations: list[str] = ['VV', 'VV+VH'],
+        start_time: datetime.datetime | str | None = None,
+        stop_time: datetime.datetime | str | None = None,
+    ) -> pd.DataFrame:
+        """SLCs along the tracks of the frame intersecting it (as `asf_search` would return them over the frame).
+
+        Parameters
+        ----------
+        frame : S1Frame
+        max_results_per_frame : int, optional
+            The most recent acquisitions are kept if there are more results
+        allowable_polarizations : list[str], optional
+        start_time : datetime.datetime | str, optional
+            Earliest `start_time` (UTC if not timezone aware)
+        stop_time : datetime.datetime | str, optional
+            Latest `start_time` (UTC if not timezone aware)
+
+        Returns
+        -------
+        pd.DataFrame
+            Table as `asf_results_to_table` sorted by decreasing start time
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        dataset = self._dataset([int(tn) for tn in frame.track_numbers])
+        if dataset is None:
+            return asf_results_to_table([])
+
+        xmin, ymin, xmax, ymax = frame.frame_geometry.bounds
+        expression = (
+            (ds.field('bbox', 'xmax') >= xmin)
+            & (ds.field('bbox', 'xmin') <= xmax)
+            & (ds.field('bbox', 'ymax') >= ymin)
+            & (ds.field('bbox', 'ymin') <= ymax)
+            & ds.field('polarization').isin(allowable_polarizations)
+        )
+        if start_time is not None:
+            expression &= ds.field('start_time') >= pa.scalar(to_utc_timestamp(start_time))
+        if stop_time is not None:
+            expression &= ds.field('start_time') <= pa.scalar(to_utc_timestamp(stop_time))
+
+        table = dataset.to_table(columns=[*ASF_PROPERTIES, 'geometry', 'start_time'], filter=expression).to_pandas()
+        table = table[intersects(from_wkb(table['geometry'].to_numpy()), frame.frame_geometry)]
+        table = table.sort_values(by='start_time', ascending=False, kind='stable').drop_duplicates(subset='fileID')
+        return table.drop(columns='start_time').head(max_results_per_frame).reset_index(drop=True)
+
+    def compact(self, track_number: int) -> int:
+        """Rewrite the files of a track as one file without duplicate SLCs; returns the number of SLCs of the track."""
+        paths = sorted(self.track_path(track_number).glob('*.parquet'))
+        if not paths:
+            return 0
+        df = pd.concat([gpd.read_parquet(p) for p in paths], ignore_index=True)
+        df = df.sort_values(by='start_time', ascending=False, kind='stable').drop_duplicates(subset='fileID')
+        self._write(track_number, df.drop(columns='bbox', errors='ignore'))
+        for p in paths:
+            p.unlink()
+        return len(df)
+
+
+def harvest_slc_metadata(
+    catalog: LocalSLCCatalog,
+    track_numbers: list[int],
+    allowable_polarizations: list[str] = ['VV', 'VV+VH'],
+    start_time: datetime.datetime | str | None = None,
+    stop_time: datetime.datetime | str | None = None,
+    intersects_with: BaseGeometry | None = None,
+) -> int:
+    """Query ASF for the SLCs along whole tracks and append them to a catalog.
+
+    Parameters
+    ----------
+    catalog : LocalSLCCatalog
+    track_numbers : list[int]
+    allowable_polarizations : list[str], optional
+    start_time : datetime.datetime | str, optional
+        By default, the start of the window of the latest pass of the track in the catalog (so SLCs of that pass
+        published after the previous harvest are added; see `LocalSLCCatalog.latest_pass_window_start`) or the
+        whole archive for tracks not in the catalog
+    stop_time : datetime.datetime | str, optional
+    intersects_with : BaseGeometry, optional
+        Only harvest SLCs intersecting this geometry, by default the whole track
+
+    Returns
+    -------
+    int
+        Number of SLCs appended; SLCs already in the catalog are skipped
+    """
+    n_slcs = 0
+    for track_number in track_numbers:
+        track_start_time = start_time if start_time is not None else catalog.latest_pass_window_start(track_number)
+        pages = asf.search_generator(
+            platform=[asf.PLATFORM.SENTINEL1],
+            relativeOrbit=[track_number],
+            polarization=allowable_polarizations,
+            beamMode=[asf.BEAMMODE.IW],
+            processingLevel=[asf.PRODUCT_TYPE.SLC],
+            intersectsWith=intersects_with.wkt if intersects_with is not None else None,
+            start=track_start_time,
+            end=stop_time,
+        )
+        tables = [asf_results_to_table(page) for page in pages]
+        if tables:
+            table = pd.concat(tables, ignore_index=True)
+            table = table[~table.fileID.isin(catalog.file_ids(track_number, start_time=track_start_time))]
+            n_slcs += catalog.append(table)
+    return n_slcs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description='Build or append to a local catalog of SLC metadata (see `LocalSLCCatalog`) from ASF'
+    )
+    parser.add_argument('catalog', type=Path, help='directory of the catalog')
+    parser.add_argument('--tracks', type=int, nargs='+', required=True, help='relative orbits to harvest')
+    parser.add_argument('--polarizations', nargs='+', default=['VV', 'VV+VH'])
+    parser.add_argument('--start', help='earliest acquisition (default: latest in the catalog for each track)')
+    parser.add_argument('--stop', help='latest acquisition')
+    parser.add_argument('--compact', action='store_true', help='rewrite each track without duplicates afterwards')
+    args = parser.parse_args()
+
+    catalog = LocalSLCCatalog(args.catalog)
+    n_slcs = harvest_slc_metadata(
+        catalog, args.tracks, allowable_polarizations=args.polarizations, start_time=args.start, stop_time=args.stop
+    )
+    print(f'Appended {n_slcs} SLCs to {catalog.path}')
+    if args.compact:
+        for track_number in args.tracks:
+            print(f'Track {track_number}: {catalog.compact(track_number)} SLCs')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,19 @@
 import json
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 import geopandas as gpd
 import pytest
 
 
+@pytest.fixture(scope='session', autouse=True)
+def catalog_cache_dir(tmp_path_factory: pytest.TempPathFactory) -> Iterator[Path]:
+    cache_dir = tmp_path_factory.mktemp('catalog_cache')
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv('S1_FRAME_ENUMERATOR_CACHE_DIR', str(cache_dir))
+        yield cache_dir
+
+
 @pytest.fixture(scope='session')
 def test_data_dir() -> Path:
     data_dir = Path(__file__).resolve().parent / 'data'
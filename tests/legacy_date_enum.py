@@ -0,0 +1,30 @@
+"""Original implementation of `enumerate_dates` used as a reference by the tests and benchmarks."""
+
+from s1_frame_enumerator.date_enum import viable_secondary_date
+
+
+def legacy_enumerate_dates(
+    dates: list, min_temporal_baseline_days: int, n_secondary_scenes_per_ref: int = 3, n_init_seeds: int = 1
+) -> list[tuple]:
+    """`enumerate_dates` as originally implemented with linear scans (for comparison only)."""
+    sorted_dates = sorted(dates, reverse=True)
+    queue = sorted_dates[:n_init_seeds]
+    dates_visited = [sorted_dates[0]]
+    pairs = []
+
+    neighbors = n_secondary_scenes_per_ref
+    while queue:
+        ref_date = queue.pop(0)
+        available_dates = [
+            date for date in sorted_dates if viable_secondary_date(date, ref_date, min_temporal_baseline_days)
+        ]
+        secondary_dates = [sec_date for sec_date in available_dates[:neighbors]]
+        pairs_temp = [(ref_date, sec_date) for sec_date in secondary_dates]
+        pairs += pairs_temp
+        for sec_date in secondary_dates:
+            if sec_date not in dates_visited:
+                dates_visited.append(sec_date)
+                queue.append(sec_date)
+
+    pairs = list(set(pairs))
+    return sorted(pairs, reverse=True)
@@ -1,9 +1,14 @@
+import dataclasses
+import os
 import warnings
+from pathlib import Path
 
+import geopandas as gpd
 import pandas as pd
 import pytest
-from shapely.geometry import Point
+from shapely.geometry import Point, Polygon, box
 
+import s1_frame_enumerator.s1_frames as s1_frames
 from s1_frame_enumerator import (
     S1Frame,
     frames2gdf,
@@ -11,13 +16,20 @@ from s1_frame_enumerator import (
     get_global_gunw_footprints,
     get_global_s1_frames,
     get_overlapping_s1_frames,
+    get_overlapping_s1_frames_batch,
+)
+from s1_frame_enumerator.s1_frames import (
+    get_catalog_bounds,
+    get_catalog_cache_path,
+    get_default_hemispheres,
+    get_geometry_by_id,
+    read_catalog,
 )
-from s1_frame_enumerator.s1_frames import get_geometry_by_id
 
 
 def test_frame_initialized_by_id() -> None:
     frame = S1Frame(9849)
-    assert frame.track_numbers == [64]
+    assert frame.track_numbers == (64,)
 
 
 def test_get_overlapping_frames() -> None:
@@ -49,6 +61,19 @@ def test_get_overlapping_frames() -> None:
     assert len(frames) == 1
 
 
+def test_get_overlapping_frames_batch() -> None:
+    aois = [Point(-120, 35).buffer(0.1), Point(41, 1.5).buffer(1), Point(-155.5, 19.5).buffer(1)]
+    frames_batch = get_overlapping_s1_frames_batch(aois)
+    assert frames_batch == [get_overlapping_s1_frames(aoi) for aoi in aois]
+
+    frames_batch = get_overlapping_s1_frames_batch(aois[:2], track_numbers=[137, 86])
+    assert frames_batch == [get_overlapping_s1_frames(aoi, track_numbers=[137, 86]) for aoi in aois[:2]]
+
+    # AOIs without frames are empty rather than raising (there are only 175 tracks)
+    assert get_overlapping_s1_frames_batch(aois[:1], track_numbers=[500]) == [[]]
+    assert get_overlapping_s1_frames_batch([]) == []
+
+
 def test_gdf2frames_consistency() -> None:
     """Ensure invertiblility of frames2gdf and gdf2frames."""
     # Hawaii
@@ -63,6 +88,70 @@ def test_gdf2frames_consistency() -> None:
     assert df_frames_0.equals(df_frames_1)
 
 
+def test_frames_from_ids() -> None:
+    frame_ids = [9847, 9848, 9849, 21248]
+    assert S1Frame.from_ids(frame_ids) == [S1Frame(frame_id) for frame_id in frame_ids]
+    assert S1Frame.from_ids([4553], hemisphere='east') == [S1Frame(4553, hemisphere='east')]
+
+    with pytest.raises(ValueError):
+        S1Frame.from_ids([9847, -1])
+
+
+def test_frames_are_interned_and_hashable() -> None:
+    frame = S1Frame(9847)
+    assert S1Frame(9847) is frame
+    assert S1Frame(9847, hemisphere=frame.hemisphere) is frame
+    assert S1Frame.from_ids([9848, 9847])[1] is frame
+    assert {frame: 1}[S1Frame(9847)] == 1
+    assert len({S1Frame(4553, hemisphere='east'), S1Frame(4553, hemisphere='west'), S1Frame(9847)}) == 3
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        frame.track_numbers = [64]
+    assert isinstance(frame.track_numbers, tuple)
+    assert not hasattr(frame, '__dict__')
+
+    df_frames = frames2gdf([frame, S1Frame(9848)], use_footprint_geometry=True)
+    assert df_frames.columns.tolist() == ['frame_id', 'hemisphere', 'track_number_min', 'track_number_max', 'geometry']
+    assert df_frames.geometry[0] == frame.footprint_geometry
+
+
+def test_interned_frames_follow_catalog_reload(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    catalog_caches = [
+        s1_frames.get_global_s1_frames,
+        s1_frames.get_global_gunw_footprints,
+        s1_frames.get_frame_id_index,
+        s1_frames.get_default_hemispheres,
+    ]
+
+    def write_catalogs(geometry: Polygon) -> None:
+        df = gpd.GeoDataFrame(
+            {'frame_id': [1], 'relative_orbit_number_min': [5], 'relative_orbit_number_max': [5]},
+            geometry=[geometry],
+            crs='EPSG:4326',
+        )
+        df.to_file(tmp_path / 'frames.geojson', driver='GeoJSON')
+        df[['frame_id', 'geometry']].to_file(tmp_path / 'footprints.geojson', driver='GeoJSON')
+        for func in catalog_caches:
+            func.cache_clear()
+
+    monkeypatch.setattr(s1_frames, 'FRAMES_PATH', tmp_path / 'frames.geojson')
+    monkeypatch.setattr(s1_frames, 'GUNW_EXTENTS_PATH', tmp_path / 'footprints.geojson')
+    try:
+        write_catalogs(box(10, 0, 11, 1))
+        frame = S1Frame(1)
+        assert S1Frame(1) is frame
+
+        write_catalogs(box(-20, 0, -18, 1))
+        frame_reloaded = S1Frame(1)
+        assert frame_reloaded is not frame
+        assert frame_reloaded.frame_geometry.equals(box(-20, 0, -18, 1))
+        assert frame_reloaded.hemisphere == 'west'
+    finally:
+        # The global catalogs are reloaded by the next test
+        for func in catalog_caches:
+            func.cache_clear()
+
+
 def test_to_ensure_footprints_contain_frames() -> None:
     df_frames = get_global_s1_frames()
     df_extents = get_global_gunw_footprints()
@@ -96,6 +185,34 @@ def test_frames_at_dateline() -> None:
                 S1Frame(frame_id, hemisphere=hemisphere)
 
 
+def test_precomputed_hemispheres_and_bounds() -> None:
+    df_frames = get_global_s1_frames()
+    default_hemispheres = get_default_hemispheres()
+    assert len(default_hemispheres) == df_frames.frame_id.nunique()
+    for frame_id in [9847, 22738, 4553]:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            frame_geometry = get_geometry_by_id(frame_id, 'frame').geometry[0]
+            frame = S1Frame(frame_id)
+        expected_hemisphere = 'west' if frame_geometry.centroid.x < 0 else 'east'
+        assert default_hemispheres[frame_id] == frame.hemisphere == expected_hemisphere
+
+    assert (get_catalog_bounds('frame') == df_frames.geometry.bounds.to_numpy()).all()
+
+
+def test_geometry_lookup_consistent_with_catalog() -> None:
+    df_frames = get_global_s1_frames()
+    for frame_id in [9849, 22738, 4553]:
+        df_expected = df_frames[df_frames.frame_id == frame_id].reset_index(drop=True)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=UserWarning)
+            df_lookup = get_geometry_by_id(frame_id, 'frame')
+        assert df_lookup.equals(df_expected)
+        for hemisphere, (xmin, xmax) in [('west', (-180, 0)), ('east', (0, 180))]:
+            df_lookup = get_geometry_by_id(frame_id, 'frame', hemisphere=hemisphere)
+            assert df_lookup.equals(df_expected.cx[xmin:xmax, :].reset_index(drop=True))
+
+
 def test_large_frame_extent_error() -> None:
     df_frame_0 = get_geometry_by_id(4553, 'frame', hemisphere='west')
     df_frame_1 = get_geometry_by_id(4553, 'frame', hemisphere='east')
@@ -119,3 +236,55 @@ def test_frame_construction_error() -> None:
 
     with pytest.raises(ValueError):
         S1Frame(100, hemisphere='EAST')
+
+
+def test_catalog_cache(tmp_path: Path) -> None:
+    source_path = tmp_path / 'frames.geojson'
+    df_source = gpd.GeoDataFrame(
+        {'frame_id': [1, 2], 'relative_orbit_number_min': [3, 4]},
+        geometry=[box(0, 0, 1, 1), box(1, 0, 2, 1)],
+        crs='EPSG:4326',
+    )
+    df_source.to_file(source_path, driver='GeoJSON')
+
+    other_source_path = tmp_path / 'other' / 'frames.geojson'
+    other_source_path.parent.mkdir()
+    df_source.to_file(other_source_path, driver='GeoJSON')
+    read_catalog(other_source_path)
+    other_cache_path = get_catalog_cache_path(other_source_path)
+
+    renames = {'relative_orbit_number_min': 'track_number_min'}
+    df_0 = read_catalog(source_path, rename_columns=renames)
+    cache_path_0 = get_catalog_cache_path(source_path)
+    assert cache_path_0.exists()
+    assert 'track_number_min' in df_0.columns
+
+    df_1 = read_catalog(source_path, rename_columns=renames)
+    assert df_0.equals(df_1)
+
+    # Updating the source invalidates the cache which is rebuilt and the stale one removed
+    df_source.iloc[:1].to_file(source_path, driver='GeoJSON')
+    stat = source_path.stat()
+    os.utime(source_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    df_2 = read_catalog(source_path, rename_columns=renames)
+    assert df_2.shape[0] == 1
+    assert get_catalog_cache_path(source_path).exists()
+    assert not cache_path_0.exists()
+    assert not list(cache_path_0.parent.glob('*.tmp'))
+    # Caches of another source with the same name (e.g. another install) are kept
+    assert other_cache_path.exists()
+
+
+def test_catalog_cache_write_failure(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    source_path = tmp_path / 'frames.geojson'
+    gpd.GeoDataFrame({'frame_id': [1]}, geometry=[box(0, 0, 1, 1)], crs='EPSG:4326').to_file(source_path)
+
+    def failing_to_parquet(self: gpd.GeoDataFrame, path: Path, **kwargs: dict) -> None:
+        Path(path).write_bytes(b'partial')
+        raise OSError('Disk full')
+
+    monkeypatch.setattr(gpd.GeoDataFrame, 'to_parquet', failing_to_parquet)
+    assert read_catalog(source_path).shape[0] == 1
+    cache_path = get_catalog_cache_path(source_path)
+    assert not cache_path.exists()
+    assert not list(cache_path.parent.glob('*.tmp'))
@@ -1,13 +1,18 @@
 import datetime
+import itertools
+import random
+from pathlib import Path
 
 import geopandas as gpd
 import pandas as pd
 import pytest
 
+from legacy_date_enum import legacy_enumerate_dates
 from s1_frame_enumerator import S1Frame, enumerate_dates, enumerate_gunw_time_series
 from s1_frame_enumerator.exceptions import InvalidStack
-from s1_frame_enumerator.ifg_enum import select_ifg_pair_from_stack
-from s1_frame_enumerator.s1_stack_formatter import S1_COLUMNS
+from s1_frame_enumerator.ifg_enum import IFG_COLUMNS, iter_gunw_time_series, select_ifg_pair_from_stack
+from s1_frame_enumerator.pass_footprints import PassFootprints
+from s1_frame_enumerator.s1_stack_formatter import S1_COLUMNS, compact_stack_dtypes
 
 
 def test_enum_dates_with_min_baseline() -> None:
@@ -69,6 +74,22 @@ def test_enum_dates_with_3_neighbors() -> None:
         assert date_pairs_expected == date_pairs
 
 
+@pytest.mark.parametrize('seed', range(20))
+def test_enum_dates_matches_legacy_implementation(seed: int) -> None:
+    rng = random.Random(seed)
+    n_dates = rng.randint(1, 150)
+    # Irregular acquisitions with duplicates and unsorted input
+    offsets = [rng.choice([rng.randint(0, 1_000), rng.randint(0, 50)]) for _ in range(n_dates)]
+    dates = [pd.Timestamp('2017-01-01', tz='UTC') + pd.Timedelta(days=offset) for offset in offsets]
+    for _ in range(8):
+        kwargs = dict(
+            min_temporal_baseline_days=rng.choice([-3, 0, 1, 6, 12, 31, 365]),
+            n_secondary_scenes_per_ref=rng.choice([-1, 0, 1, 2, 3, 5]),
+            n_init_seeds=rng.choice([1, 2, 3, 10]),
+        )
+        assert enumerate_dates(dates, **kwargs) == legacy_enumerate_dates(dates, **kwargs)
+
+
 def test_select_valid_ifg_pairs_using_frame_and_dates(sample_stack: gpd.GeoDataFrame) -> None:
     frames = [S1Frame(21248), S1Frame(21249)]
 
@@ -86,6 +107,18 @@ def test_select_valid_ifg_pairs_using_frame_and_dates(sample_stack: gpd.GeoDataF
     data = select_ifg_pair_from_stack(ref_date, sec_date, sample_stack, None)
     assert len(data['reference']) == 3
 
+    # Same selection from the SLCs and components cached per (date, frame)
+    pass_footprints = PassFootprints.from_stack(sample_stack)
+    for frame in frames + [None]:
+        data = select_ifg_pair_from_stack(ref_date, sec_date, sample_stack, frame)
+        for _ in range(2):
+            data_cached = select_ifg_pair_from_stack(
+                ref_date, sec_date, sample_stack, frame, pass_footprints=pass_footprints
+            )
+            assert data_cached['reference'] == data['reference']
+            assert data_cached['secondary'] == data['secondary']
+            assert data_cached['geometry'].equals(data['geometry'])
+
 
 def test_enum_by_track(sample_stack: gpd.GeoDataFrame) -> None:
     data = enumerate_gunw_time_series(
@@ -147,3 +180,105 @@ def test_geometry_filtering(df_nz_146_stack: gpd.GeoDataFrame) -> None:
     for ifg, expected_ifg in zip(ifg_prev_disconnected, expected_ifgs):
         assert ifg['reference'] == expected_ifg['reference']
         assert ifg['secondary'] == expected_ifg['secondary']
+
+
+def test_enum_by_track_with_pass_footprints(df_nz_146_stack: gpd.GeoDataFrame) -> None:
+    # Footprints of the passes are shared by all pairs rather than recomputed per pair
+    ifg_data = enumerate_gunw_time_series(df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365)
+    pass_footprints = PassFootprints.from_stack(df_nz_146_stack)
+    assert len(pass_footprints.df_passes) == df_nz_146_stack.repeat_pass_timestamp.nunique()
+
+    dates = df_nz_146_stack.repeat_pass_timestamp.unique().tolist()
+    ifg_dates = enumerate_dates(dates, 365, n_init_seeds=3)
+    ifg_data_expected = [select_ifg_pair_from_stack(ref, sec, df_nz_146_stack) for (ref, sec) in ifg_dates]
+    ifg_data_expected = [ifg for ifg in ifg_data_expected if ifg]
+
+    assert len(ifg_data) == len(ifg_data_expected) > 0
+    for ifg, ifg_expected in zip(ifg_data, ifg_data_expected):
+        assert ifg['reference'] == ifg_expected['reference']
+        assert ifg['secondary'] == ifg_expected['secondary']
+        assert ifg['geometry'].equals(ifg_expected['geometry'])
+
+    # Evicting components from a bounded cache does not change the selection
+    pass_footprints = PassFootprints.from_stack(df_nz_146_stack, max_cached_components=2)
+    ifg_data_bounded = enumerate_gunw_time_series(
+        df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365, pass_footprints=pass_footprints
+    )
+    assert [ifg['reference'] for ifg in ifg_data_bounded] == [ifg['reference'] for ifg in ifg_data]
+    assert [ifg['secondary'] for ifg in ifg_data_bounded] == [ifg['secondary'] for ifg in ifg_data]
+    assert len(pass_footprints._largest_components) == 2
+    assert pass_footprints.cache_misses > len(dates)
+
+
+def test_enum_with_worker_processes(df_nz_146_stack: gpd.GeoDataFrame) -> None:
+    ifg_data = enumerate_gunw_time_series(df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365)
+    ifg_data_parallel = enumerate_gunw_time_series(
+        df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365, n_workers=2
+    )
+
+    assert len(ifg_data_parallel) == len(ifg_data) > 0
+    for ifg_parallel, ifg in zip(ifg_data_parallel, ifg_data):
+        assert ifg_parallel['reference'] == ifg['reference']
+        assert ifg_parallel['secondary'] == ifg['secondary']
+        assert ifg_parallel['reference_date'] == ifg['reference_date']
+        assert ifg_parallel['geometry'].equals(ifg['geometry'])
+
+    pass_footprints = PassFootprints.from_stack(df_nz_146_stack)
+    with pytest.raises(ValueError):
+        enumerate_gunw_time_series(df_nz_146_stack, pass_footprints=pass_footprints, n_workers=2)
+
+
+@pytest.mark.parametrize('n_workers', [1, 2])
+def test_iter_gunw_time_series(df_nz_146_stack: gpd.GeoDataFrame, n_workers: int) -> None:
+    ifg_data = enumerate_gunw_time_series(df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365)
+
+    ifg_iter = iter_gunw_time_series(
+        df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365, n_workers=n_workers
+    )
+    first_ifgs = list(itertools.islice(ifg_iter, 5))
+    assert [ifg['reference'] for ifg in first_ifgs] == [ifg['reference'] for ifg in ifg_data[:5]]
+    # Stopping early does not wait on the remaining pairs
+    ifg_iter.close()
+
+    ifg_iter = iter_gunw_time_series(
+        df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365, n_workers=n_workers
+    )
+    ifg_data_streamed = list(ifg_iter)
+    assert [ifg['reference'] for ifg in ifg_data_streamed] == [ifg['reference'] for ifg in ifg_data]
+    assert [ifg['secondary'] for ifg in ifg_data_streamed] == [ifg['secondary'] for ifg in ifg_data]
+
+
+def test_iter_gunw_time_series_validates_on_call(df_nz_146_stack: gpd.GeoDataFrame) -> None:
+    with pytest.raises(InvalidStack):
+        iter_gunw_time_series(df_nz_146_stack.iloc[:0])
+
+
+def test_enum_as_geodataframe(df_nz_146_stack: gpd.GeoDataFrame, tmp_path: Path) -> None:
+    ifg_data = enumerate_gunw_time_series(df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365)
+    df_ifgs = enumerate_gunw_time_series(
+        df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365, output_format='geodataframe'
+    )
+
+    assert df_ifgs.columns.tolist() == IFG_COLUMNS
+    assert df_ifgs.shape[0] == len(ifg_data)
+    assert [list(ref) for ref in df_ifgs.reference] == [ifg['reference'] for ifg in ifg_data]
+    assert df_ifgs.secondary_date.tolist() == [ifg['secondary_date'] for ifg in ifg_data]
+    assert df_ifgs.frame_id.isna().all()
+    assert df_ifgs.geometry.geom_equals(gpd.GeoSeries([ifg['geometry'] for ifg in ifg_data], crs=df_ifgs.crs)).all()
+
+    df_ifgs.to_parquet(tmp_path / 'ifgs.parquet')
+    df_ifgs_read = gpd.read_parquet(tmp_path / 'ifgs.parquet')
+    assert [list(sec) for sec in df_ifgs_read.secondary] == [ifg['secondary'] for ifg in ifg_data]
+
+    with pytest.raises(ValueError):
+        enumerate_gunw_time_series(df_nz_146_stack, output_format='json')
+
+
+def test_enum_with_compact_dtypes(df_nz_146_stack: gpd.GeoDataFrame) -> None:
+    df_compact = compact_stack_dtypes(df_nz_146_stack)
+    assert df_compact.memory_usage(deep=True).sum() < df_nz_146_stack.memory_usage(deep=True).sum()
+
+    ifg_data = enumerate_gunw_time_series(df_nz_146_stack, n_init_seeds=3, min_temporal_baseline_days=365)
+    ifg_data_compact = enumerate_gunw_time_series(df_compact, n_init_seeds=3, min_temporal_baseline_days=365)
+    assert [ifg['reference'] for ifg in ifg_data_compact] == [ifg['reference'] for ifg in ifg_data]
+    assert [ifg['secondary'] for ifg in ifg_data_compact] == [ifg['secondary'] for ifg in ifg_data]
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+import pytest
+
+import s1_frame_enumerator
+
+
+HEAVY_MODULES = ['geopandas', 'shapely', 'pandas', 'asf_search', 'rasterio', 'tqdm', 'requests']
+
+
+def test_lazy_import_of_enumerate_dates() -> None:
+    # Fresh interpreter so modules imported by other tests do not interfere
+    code = (
+        'import sys\n'
+        'from s1_frame_enumerator import enumerate_dates\n'
+        f'print(",".join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n'
+    )
+    out = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == ''
+
+
+def test_public_api_resolves() -> None:
+    for name in s1_frame_enumerator.__all__:
+        assert getattr(s1_frame_enumerator, name) is not None
+    assert set(s1_frame_enumerator.__all__) <= set(dir(s1_frame_enumerator))
+
+    with pytest.raises(AttributeError):
+        s1_frame_enumerator.not_an_attribute  # noqa: B018
+
+
+def test_stack_import_without_pyarrow() -> None:
+    # pyarrow is only needed by `LocalSLCCatalog`
+    code = (
+        'import sys\n'
+        'sys.modules["pyarrow"] = None\n'
+        'from s1_frame_enumerator import LocalSLCCatalog, aget_s1_stack, get_s1_stack\n'
+        'from s1_frame_enumerator.s1_stack import update_s1_stack\n'
+    )
+    subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
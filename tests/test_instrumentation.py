@@ -0,0 +1,85 @@
+from collections.abc import Callable
+
+import geopandas as gpd
+import pytest
+
+import s1_frame_enumerator.instrumentation as instrumentation
+import s1_frame_enumerator.s1_stack as s1_stack
+from s1_frame_enumerator import S1Frame, StageStats, enumerate_gunw_time_series, get_s1_stack
+
+
+def test_stage_stats() -> None:
+    finished = []
+    stats = StageStats(callback=lambda name, record: finished.append((name, record.calls)), trace_memory=True)
+    for _ in range(2):
+        with stats.stage('outer'):
+            with stats.stage('inner'):
+                data = list(range(100_000))
+            del data
+            stats.add('outer', records=3, cache_hits=1)
+
+    assert finished == [('inner', 1), ('outer', 1), ('inner', 2), ('outer', 2)]
+    outer, inner = stats.stages['outer'], stats.stages['inner']
+    assert (outer.calls, outer.records, outer.cache_hits, outer.cache_misses) == (2, 6, 2, 0)
+    assert outer.seconds >= inner.seconds > 0
+    # The peak of the nested stage counts towards the outer stage even though it was freed before the outer ended
+    assert outer.peak_memory_bytes >= inner.peak_memory_bytes > 100_000 * 28
+
+    df = stats.to_dataframe()
+    assert df.index.tolist() == ['outer', 'inner']
+    assert df.loc['outer', 'records'] == 6
+
+
+def test_profile_stats() -> None:
+    with pytest.raises(ValueError):
+        StageStats().profile_stats()
+
+    stats = StageStats(profile=True)
+    with stats.stage('sort'):
+        sorted(range(1_000), key=lambda x: -x)
+    profiled_functions = {func for (_, _, func) in stats.profile_stats().stats}
+    assert '<lambda>' in profiled_functions
+    assert stats.stages['sort'].peak_memory_bytes is None
+
+
+def test_progress_bar_without_tqdm(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(instrumentation, 'tqdm', None)
+    assert list(instrumentation.progress_bar(range(3), desc='Test')) == [0, 1, 2]
+    with instrumentation.progress_bar(total=3) as progress:
+        progress.update(1)
+
+
+def test_enumeration_stats(df_nz_146_stack: gpd.GeoDataFrame) -> None:
+    stats = StageStats()
+    ifgs = enumerate_gunw_time_series(df_nz_146_stack, stats=stats, show_progress=False)
+    ifgs_without_stats = enumerate_gunw_time_series(df_nz_146_stack, show_progress=False)
+    assert ifgs == ifgs_without_stats
+
+    n_dates = df_nz_146_stack.repeat_pass_timestamp.nunique()
+    assert stats.stages['enumerate_dates'].calls == 1
+    n_pairs = stats.stages['enumerate_dates'].records
+    select_pairs = stats.stages['select_pairs']
+    assert select_pairs.calls == n_pairs
+    assert select_pairs.records == len(ifgs)
+    # Each date is a reference or secondary of several pairs but its largest connected component is computed once
+    assert select_pairs.cache_misses == n_dates
+    assert select_pairs.cache_hits == 2 * n_pairs - n_dates
+
+
+def test_stack_stats(
+    monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    def mock_response(frame: S1Frame, **kwargs: dict) -> list[dict]:
+        return asf_results_from_query_by_frame(frame.frame_id)
+
+    monkeypatch.setattr(s1_stack, 'query_slc_metadata_over_frame', mock_response)
+
+    frames = [S1Frame(9847), S1Frame(9848)]
+    stats = StageStats()
+    df_stack = get_s1_stack(frames, stats=stats, show_progress=False)
+
+    n_results = sum(len(asf_results_from_query_by_frame(frame.frame_id)) for frame in frames)
+    assert list(stats.stages) == ['query', 'format', 'coverage_filters']
+    assert stats.stages['query'].records == n_results
+    assert stats.stages['coverage_filters'].records == len(df_stack)
+    assert all(record.calls == 1 for record in stats.stages.values())
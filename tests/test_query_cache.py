@@ -0,0 +1,104 @@
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+import s1_frame_enumerator.s1_stack as s1_stack
+from s1_frame_enumerator import QueryCache, S1Frame
+from s1_frame_enumerator.s1_stack import query_slc_metadata_over_frame
+from s1_frame_enumerator.s1_stack_formatter import asf_results_to_table
+
+
+def test_cache_hits_and_misses(tmp_path: Path) -> None:
+    cache = QueryCache(tmp_path / 'cache.sqlite')
+    results = [{'properties': {'fileID': 'a'}, 'geometry': None}]
+
+    assert cache.get('key') is None
+    cache.put('key', results)
+    assert cache.get('key') == results
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'entries': 1, 'size_bytes': cache.stats()['size_bytes']}
+
+    # Persisted across instances
+    assert QueryCache(tmp_path / 'cache.sqlite').get('key') == results
+
+    # Bypass reads but still writes
+    cache_bypass = QueryCache(tmp_path / 'cache.sqlite', bypass=True)
+    assert cache_bypass.get('key') is None
+    cache_bypass.put('key_2', results)
+    assert cache.get('key_2') == results
+
+
+def test_cache_tables(tmp_path: Path, asf_results_from_query_by_frame: Callable[[int], list[dict]]) -> None:
+    table = asf_results_to_table(asf_results_from_query_by_frame(9847))
+    cache = QueryCache(tmp_path / 'cache.sqlite')
+    cache.put('key', table)
+    assert cache.get('key').equals(table)
+
+
+def test_cache_ttl_and_size_eviction(tmp_path: Path) -> None:
+    cache = QueryCache(tmp_path / 'cache.sqlite', ttl_seconds=0.1)
+    cache.put('key', [{'a': 1}])
+    time.sleep(0.2)
+    assert cache.get('key') is None
+    assert cache.stats()['entries'] == 0
+
+    results = [{'id': str(k) * 100} for k in range(100)]
+    cache = QueryCache(tmp_path / 'cache_small.sqlite', max_size_bytes=1)
+    cache.put('key_0', results)
+    # Results larger than the maximum size are never stored
+    assert cache.get('key_0') is None
+    assert cache.stats()['entries'] == 0
+
+    cache.max_size_bytes = None
+    cache.put('key_0', [{'a': 1}])
+    cache.max_size_bytes = 1
+    cache.put('key_0', results)
+    # An oversized result replaces (drops) a stale entry with the same key
+    assert cache.get('key_0') is None
+    assert cache.stats()['entries'] == 0
+
+    cache.max_size_bytes = 10_000
+    cache.put('key_0', results)
+    cache.put('key_1', results)
+    cache.get('key_0')
+    size_entry = cache.stats()['size_bytes'] // 2
+    cache.max_size_bytes = 2 * size_entry + size_entry // 2
+    cache.put('key_2', results)
+    # key_1 is the least recently used
+    assert cache.get('key_1') is None
+    assert cache.get('key_0') == results
+    assert cache.get('key_2') == results
+
+
+def test_query_uses_cache(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    n_calls = 0
+
+    class MockProduct:
+        def __init__(self, data: dict) -> None:
+            self.data = data
+
+        def geojson(self) -> dict:
+            return self.data
+
+    def mock_geo_search(*args: Any, **kwargs: Any) -> list[MockProduct]:  # noqa: ANN401
+        nonlocal n_calls
+        n_calls += 1
+        return [MockProduct(r) for r in asf_results_from_query_by_frame(9847)]
+
+    monkeypatch.setattr(s1_stack.asf, 'geo_search', mock_geo_search)
+    frame = S1Frame(9847)
+    cache = QueryCache(tmp_path / 'cache.sqlite')
+
+    results_0 = query_slc_metadata_over_frame(frame, cache=cache)
+    results_1 = query_slc_metadata_over_frame(frame, cache=cache)
+    assert results_0 == results_1
+    assert n_calls == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # Different query parameters are different entries
+    query_slc_metadata_over_frame(frame, cache=cache, allowable_polarizations=['VV'])
+    assert n_calls == 2
@@ -0,0 +1,133 @@
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pandas as pd
+import pytest
+from shapely.geometry import box, shape
+from shapely.ops import unary_union
+
+import s1_frame_enumerator.s1_stack as s1_stack
+import s1_frame_enumerator.slc_catalog as slc_catalog
+from s1_frame_enumerator import LocalSLCCatalog, S1Frame, get_s1_stack, harvest_slc_metadata
+from s1_frame_enumerator.s1_stack_formatter import asf_results_to_table, format_results_for_sent1_stack
+
+
+def make_frame(geometry: Any, track_numbers: list[int] = [64]) -> SimpleNamespace:  # noqa: ANN401
+    return SimpleNamespace(frame_id=0, hemisphere=None, track_numbers=track_numbers, frame_geometry=geometry)
+
+
+@pytest.fixture
+def asf_results(asf_results_from_query_by_frame: Callable[[int], list[dict]]) -> list[dict]:
+    # Both frames are along track 64 and share some SLCs
+    return asf_results_from_query_by_frame(9847) + asf_results_from_query_by_frame(9848)
+
+
+def test_query_matches_asf_results(tmp_path: Path, asf_results: list[dict]) -> None:
+    catalog = LocalSLCCatalog(tmp_path / 'catalog')
+    assert catalog.track_numbers == []
+    assert catalog.query(make_frame(box(0, 0, 1, 1))).empty
+
+    # Appended in two parts (so one track has several files) with overlapping SLCs
+    assert catalog.append(asf_results[:600]) == 600
+    assert catalog.append(asf_results_to_table(asf_results[400:])) == len(asf_results) - 400
+    assert catalog.track_numbers == [64]
+    assert len(list(catalog.track_path(64).glob('*.parquet'))) == 2
+
+    footprints = [shape(r['geometry']) for r in asf_results]
+    frame_geometry = unary_union(footprints[:10]).envelope
+    table = catalog.query(make_frame(frame_geometry))
+    expected = [r for (r, footprint) in zip(asf_results, footprints) if footprint.intersects(frame_geometry)]
+    assert len(table) == len({r['properties']['fileID'] for r in expected})
+    assert table.startTime.is_monotonic_decreasing
+    assert format_results_for_sent1_stack(table).equals(format_results_for_sent1_stack(expected))
+
+    # No results from other tracks or elsewhere
+    assert catalog.query(make_frame(frame_geometry, track_numbers=[65])).empty
+    assert catalog.query(make_frame(box(0, 0, 1, 1))).empty
+
+
+def test_query_filters(tmp_path: Path, asf_results: list[dict]) -> None:
+    catalog = LocalSLCCatalog(tmp_path)
+    catalog.append(asf_results)
+    frame = make_frame(unary_union([shape(r['geometry']) for r in asf_results]))
+    table = catalog.query(frame)
+    start_time = pd.to_datetime(table.startTime)
+
+    table_vv = catalog.query(frame, allowable_polarizations=['VV'])
+    assert 0 < len(table_vv) < len(table)
+    assert (table_vv.polarization == 'VV').all()
+
+    table_2020 = catalog.query(frame, start_time='2020-01-01', stop_time='2021-01-01')
+    assert len(table_2020) == ((start_time >= '2020-01-01') & (start_time <= '2021-01-01')).sum()
+
+    assert catalog.query(frame, max_results_per_frame=10).equals(table.head(10))
+    assert catalog.latest_start_time(64) == start_time.max()
+    assert catalog.latest_start_time(65) is None
+
+
+def test_compact(tmp_path: Path, asf_results: list[dict]) -> None:
+    catalog = LocalSLCCatalog(tmp_path)
+    catalog.append(asf_results)
+    catalog.append(asf_results[:100])
+    frame = make_frame(unary_union([shape(r['geometry']) for r in asf_results]))
+    table = catalog.query(frame)
+
+    assert catalog.compact(64) == len(table)
+    assert len(list(catalog.track_path(64).glob('*.parquet'))) == 1
+    assert catalog.query(frame).equals(table)
+    assert catalog.compact(65) == 0
+
+
+def test_harvest_slc_metadata(monkeypatch: pytest.MonkeyPatch, tmp_path: Path, asf_results: list[dict]) -> None:
+    searches = []
+    start_times = [pd.Timestamp(r['properties']['startTime']) for r in asf_results]
+    # The first SLC of the latest pass is published after the first harvest
+    late_start_time = min(t for t in start_times if t > max(start_times) - pd.Timedelta(days=1))
+    assert late_start_time < max(start_times)
+    late_results = [r for (r, t) in zip(asf_results, start_times) if t == late_start_time]
+    published = [r for (r, t) in zip(asf_results, start_times) if t != late_start_time]
+
+    def mock_search_generator(**kwargs: Any) -> Iterator[list[dict]]:  # noqa: ANN401
+        searches.append(kwargs)
+        results = [r for r in published if r['properties']['pathNumber'] in kwargs['relativeOrbit']]
+        if kwargs['start'] is not None:
+            results = [r for r in results if pd.Timestamp(r['properties']['startTime']) >= kwargs['start']]
+        yield from (results[i : i + 250] for i in range(0, len(results), 250))
+
+    monkeypatch.setattr(slc_catalog.asf, 'search_generator', mock_search_generator)
+    catalog = LocalSLCCatalog(tmp_path)
+    assert harvest_slc_metadata(catalog, [64, 65]) == len(published)
+    assert [s['relativeOrbit'] for s in searches] == [[64], [65]]
+    assert searches[0]['start'] is None
+    # Only one file per track and harvest
+    assert len(list(catalog.track_path(64).glob('*.parquet'))) == 1
+
+    # Appending queries the acquisitions from the window of the latest pass and only adds the late SLCs
+    window_start = catalog.latest_pass_window_start(64)
+    assert window_start <= late_start_time
+    published += late_results
+    assert harvest_slc_metadata(catalog, [64]) == len(late_results)
+    assert searches[-1]['start'] == window_start
+    assert catalog.file_ids(64) == {r['properties']['fileID'] for r in asf_results}
+    # Nothing new
+    assert harvest_slc_metadata(catalog, [64]) == 0
+    assert len(list(catalog.track_path(64).glob('*.parquet'))) == 2
+
+
+def test_stack_from_local_catalog(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    frames = [S1Frame(9847), S1Frame(9848)]
+    catalog = LocalSLCCatalog(tmp_path)
+    for frame in frames:
+        catalog.append(asf_results_from_query_by_frame(frame.frame_id))
+
+    def mock_response(frame: S1Frame, **kwargs: dict) -> list[dict]:
+        return asf_results_from_query_by_frame(frame.frame_id)
+
+    df_stack_local = get_s1_stack(frames, query_backend=catalog)
+    monkeypatch.setattr(s1_stack, 'query_slc_metadata_over_frame', mock_response)
+    df_stack = get_s1_stack(frames)
+    assert df_stack_local.equals(df_stack)
@@ -1,17 +1,33 @@
-from collections.abc import Callable
+import threading
+import time
+import warnings
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any
 
+import pandas as pd
 import pytest
+import requests
 from shapely.ops import unary_union
 
 import s1_frame_enumerator.s1_stack as s1_stack
-from s1_frame_enumerator import S1Frame, frames2gdf, get_s1_stack
+from s1_frame_enumerator import MIN_S1C_DATE, S1Frame, frames2gdf, get_s1_stack
 from s1_frame_enumerator.exceptions import StackFormationError
 from s1_frame_enumerator.s1_stack import (
+    ASFSessionWithTimeout,
     filter_s1_stack_by_geometric_coverage_per_frame,
     filter_s1_stack_by_geometric_coverage_per_pass,
+    filter_s1c_data,
+    update_s1_stack,
+)
+from s1_frame_enumerator.s1_stack_formatter import (
+    S1_COLUMNS,
+    asf_results_to_table,
+    compact_stack_dtypes,
+    format_results_for_sent1_stack,
+    is_compact_stack,
+    parse_slc_ids,
 )
-from s1_frame_enumerator.s1_stack_formatter import S1_COLUMNS, format_results_for_sent1_stack
 
 
 def test_disconnected_frames_and_same_track() -> None:
@@ -68,6 +84,137 @@ def test_column_structure(
     assert df_stack.columns.tolist() == S1_COLUMNS
 
 
+@pytest.mark.parametrize('frame_id', [9847, 9848, 13403, 13404])
+def test_repeat_pass_grouping_matches_julian_dates(
+    frame_id: int, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    df_stack = format_results_for_sent1_stack(asf_results_from_query_by_frame(frame_id))
+
+    # Grouping via julian dates (one row at a time) as originally implemented
+    julian_dates = df_stack.start_time.map(lambda dt: dt.to_julian_date())
+    pass_ids = ((julian_dates - julian_dates[0]) // 5).astype(int)
+    pass_ids = pass_ids.groupby(pass_ids).ngroup()
+    utc_dates = pd.to_datetime(df_stack.start_time.dt.date).map(lambda ts: ts.tz_localize('UTC'))
+    pass_timestamps = pass_ids.map(utc_dates.groupby(pass_ids).min().to_dict())
+
+    assert df_stack.stack_repeat_pass_id.equals(pass_ids)
+    assert (df_stack.repeat_pass_timestamp == pass_timestamps).all()
+
+
+@pytest.mark.parametrize('frame_id', [9847, 13403])
+def test_format_table_matches_geojson(
+    frame_id: int, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    results = asf_results_from_query_by_frame(frame_id)
+    df_geojson = format_results_for_sent1_stack(results)
+    df_table = format_results_for_sent1_stack(asf_results_to_table(results))
+    assert df_table.equals(df_geojson)
+
+
+def test_streamed_query_matches_geojson(
+    monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    class MockProduct:
+        def __init__(self, result: dict) -> None:
+            self.properties = result['properties']
+            self.geometry = result['geometry']
+
+    def mock_search_generator(*args: Any, intersectsWith: str, **kwargs: Any) -> Iterator[list[MockProduct]]:  # noqa: ANN401, N803
+        frame_id = 9847 if intersectsWith == S1Frame(9847).frame_geometry.wkt else 9848
+        results = asf_results_from_query_by_frame(frame_id)
+        for k in range(0, len(results), 25):
+            yield [MockProduct(r) for r in results[k : k + 25]]
+
+    def mock_geo_search(*args: Any, **kwargs: Any) -> list[Any]:  # noqa: ANN401
+        products = [p for page in mock_search_generator(**kwargs) for p in page]
+        for p in products:
+            p.geojson = lambda p=p: {'type': 'Feature', 'properties': p.properties, 'geometry': p.geometry}
+        return products
+
+    monkeypatch.setattr(s1_stack.asf, 'search_generator', mock_search_generator)
+    monkeypatch.setattr(s1_stack.asf, 'geo_search', mock_geo_search)
+    frames = [S1Frame(9847), S1Frame(9848)]
+    df_streamed = get_s1_stack(frames, stream_query_results=True)
+    df_geojson = get_s1_stack(frames)
+    assert not df_streamed.empty
+    assert df_streamed.equals(df_geojson)
+
+
+def test_per_frame_coverage_matches_pairwise_loop(
+    asf_results_from_query_by_frame: Callable[[int], list[dict]],
+) -> None:
+    results = asf_results_from_query_by_frame(9847) + asf_results_from_query_by_frame(9848)
+    df_stack = format_results_for_sent1_stack(results)
+    frames = [S1Frame(9847), S1Frame(9848)]
+
+    # Per (pass, frame) computation as originally implemented
+    df_stack_one_pass = df_stack.dissolve(by='repeat_pass_timestamp', aggfunc={'start_time': 'min'}, as_index=False)
+    passes_to_exclude = [
+        one_pass.repeat_pass_timestamp
+        for one_pass in df_stack_one_pass.itertuples()
+        for frame in frames
+        if frame.footprint_geometry.intersection(one_pass.geometry).area / frame.footprint_geometry.area < 0.5
+    ]
+    df_expected = df_stack[~df_stack.repeat_pass_timestamp.isin(passes_to_exclude)].reset_index(drop=True)
+
+    with warnings.catch_warnings(record=True) as record:
+        warnings.simplefilter('always')
+        df_filtered = filter_s1_stack_by_geometric_coverage_per_frame(df_stack, frames, 0.5)
+    assert df_filtered.equals(df_expected)
+    assert 0 < df_filtered.shape[0] < df_stack.shape[0]
+    # One aggregated warning rather than one per (pass, frame)
+    assert len(record) == 1
+
+
+def test_compact_dtypes(asf_results_from_query_by_frame: Callable[[int], list[dict]]) -> None:
+    results = asf_results_from_query_by_frame(13403) + asf_results_from_query_by_frame(13404)
+    df_stack = format_results_for_sent1_stack(results)
+    df_compact = compact_stack_dtypes(df_stack)
+
+    assert is_compact_stack(df_compact) and not is_compact_stack(df_stack)
+    assert df_compact.track_number.dtype == 'int16'
+    assert isinstance(df_compact.polarization.dtype, pd.CategoricalDtype)
+    assert df_compact.memory_usage(deep=True).sum() < df_stack.memory_usage(deep=True).sum()
+    # Same values
+    assert df_compact.astype(df_stack.dtypes.to_dict()).equals(df_stack)
+    assert filter_s1c_data(df_compact).equals(compact_stack_dtypes(filter_s1c_data(df_stack)))
+
+
+def test_filter_s1c_data(asf_results_from_query_by_frame: Callable[[int], list[dict]]) -> None:
+    df_stack = format_results_for_sent1_stack(asf_results_from_query_by_frame(9847)).iloc[:40]
+    # Relabel a few SLCs as S1C either side of the minimum date
+    ind_s1c = df_stack.index % 2 == 0
+    ind_late = df_stack.index % 4 == 0
+    df_stack['slc_id'] = df_stack.slc_id.where(~ind_s1c, 'S1C' + df_stack.slc_id.str[3:])
+    df_stack['start_time'] = df_stack.start_time.where(~ind_late, MIN_S1C_DATE)
+
+    df_filtered = filter_s1c_data(df_stack)
+    assert df_filtered.slc_id.tolist() == df_stack.slc_id[~ind_s1c | ind_late].tolist()
+    assert filter_s1c_data(compact_stack_dtypes(df_stack)).slc_id.tolist() == df_filtered.slc_id.tolist()
+
+    # S1C ids not following the naming convention (a lowercase product id) are filtered all the same
+    df_malformed = df_stack.assign(slc_id=df_stack.slc_id.where(~ind_s1c, df_stack.slc_id.str[:-4] + 'a1b2'))
+    assert parse_slc_ids(df_malformed.slc_id[ind_s1c]).platform.isna().all()
+    assert filter_s1c_data(df_malformed).slc_id.tolist() == df_malformed.slc_id[~ind_s1c | ind_late].tolist()
+
+
+def test_parse_slc_ids() -> None:
+    slc_ids = pd.Series(['S1B_IW_SLC__1SSV_20161221T173720_20161221T173747_003497_005FA6_A1A2', 'not-an-slc'])
+    df_fields = parse_slc_ids(slc_ids)
+
+    fields = df_fields.iloc[0]
+    assert fields.platform == 'S1B'
+    assert fields.beam_mode == 'IW'
+    assert fields.polarization_code == 'SV'
+    assert fields.start_time == pd.Timestamp('2016-12-21T17:37:20', tz='UTC')
+    assert fields.absolute_orbit == 3497
+    assert fields.datatake_id == '005FA6'
+    assert df_fields.iloc[1].isna().all()
+    df_platforms = parse_slc_ids(slc_ids, fields=['platform'])
+    assert df_platforms.columns.tolist() == ['platform']
+    assert df_platforms.platform.equals(df_fields.platform)
+
+
 def test_sequential_tracks(
     monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
 ) -> None:
@@ -87,6 +234,100 @@ def test_sequential_tracks(
     assert track_numbers == [86, 87]
 
 
+def test_concurrent_queries_match_serial(
+    monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    frames = [S1Frame(9847), S1Frame(9848)]
+    n_in_flight, max_in_flight = 0, 0
+    lock = threading.Lock()
+
+    def mock_response(frame: S1Frame, **kwargs: Any) -> list[dict]:  # noqa: ANN401
+        nonlocal n_in_flight, max_in_flight
+        with lock:
+            n_in_flight += 1
+            max_in_flight = max(max_in_flight, n_in_flight)
+        # First frame finishes last so completion order differs from frame order
+        time.sleep(0.2 if frame.frame_id == 9847 else 0.01)
+        with lock:
+            n_in_flight -= 1
+        return asf_results_from_query_by_frame(frame.frame_id)
+
+    monkeypatch.setattr(s1_stack, 'query_slc_metadata_over_frame', mock_response)
+
+    df_serial = get_s1_stack(frames)
+    assert max_in_flight == 1
+    df_concurrent = get_s1_stack(frames, max_concurrent_queries=2)
+    assert max_in_flight == 2
+    assert df_serial.equals(df_concurrent)
+
+
+def test_update_stack_matches_full_stack(
+    monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    results = asf_results_from_query_by_frame(9847) + asf_results_from_query_by_frame(9848)
+    query_start_times = []
+
+    def mock_response(*args: Any, start_time: pd.Timestamp = None, **kwargs: Any) -> list[dict]:  # noqa: ANN401
+        query_start_times.append(start_time)
+        if start_time is None:
+            return results
+        return [r for r in results if pd.Timestamp(r['properties']['startTime']) >= start_time]
+
+    monkeypatch.setattr(s1_stack, 'query_slc_metadata_over_frame', mock_response)
+    frames = [S1Frame(9847), S1Frame(9848)]
+    df_full = get_s1_stack(frames)
+
+    df_old = df_full[df_full.start_time < pd.Timestamp('2020-06-01', tz='UTC')]
+    # Latest pass is only partially available in the stored stack: its first SLC was published late
+    ind_latest_pass = df_old.stack_repeat_pass_id == df_old.stack_repeat_pass_id.iloc[-1]
+    assert ind_latest_pass.sum() > 1
+    latest_pass_start_time = df_old.start_time[ind_latest_pass].min()
+    previous_pass_start_time = df_old.start_time[~ind_latest_pass].max()
+    df_old = df_old.drop(index=df_old.index[ind_latest_pass][0]).reset_index(drop=True)
+    df_updated = update_s1_stack(df_old, frames)
+
+    assert previous_pass_start_time < query_start_times[-1] <= latest_pass_start_time
+    # Pass ids can only differ from the full stack if its first acquisition was removed by the coverage filters
+    # (the 5 day binning is anchored there) so we check they are consistent with the stored stack instead
+    cols = [c for c in df_full.columns if c != 'stack_repeat_pass_id']
+    assert df_updated[cols].equals(df_full[cols])
+    n_old = df_old.shape[0]
+    assert df_updated.stack_repeat_pass_id[:n_old].equals(df_old.stack_repeat_pass_id)
+    assert df_updated.stack_repeat_pass_id.is_monotonic_increasing
+    # Nothing new
+    assert update_s1_stack(df_full, frames).equals(df_full)
+
+
+@pytest.fixture
+def slow_server() -> Iterator[str]:
+    class SlowHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(1)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, *args: Any) -> None:  # noqa: ANN401
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}'
+    server.shutdown()
+    server.server_close()
+
+
+def test_query_timeout(slow_server: str) -> None:
+    session = ASFSessionWithTimeout(timeout=0.1)
+    with pytest.raises(requests.exceptions.Timeout):
+        session.get(slow_server)
+    # Explicit timeouts passed by asf_search are overridden
+    with pytest.raises(requests.exceptions.Timeout):
+        session.get(slow_server, timeout=10)
+
+    assert ASFSessionWithTimeout(timeout=5).get(slow_server).status_code == 200
+
+
 def filter_per_pass(CA_20210915_resp: dict) -> None:
     # The resp data for one date for the first 2 frames
     data_json = CA_20210915_resp
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable, Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from shapely.geometry import box
+
+import s1_frame_enumerator.s1_stack as s1_stack
+import s1_frame_enumerator.s1_stack_async as s1_stack_async
+from s1_frame_enumerator import S1Frame, aget_s1_stack, aquery_slc_metadata_over_frame, get_s1_stack
+
+
+@pytest.fixture
+def search_server() -> Iterator[SimpleNamespace]:
+    """Stand-in for the search API recording the number of requests in flight at once."""
+    state = SimpleNamespace(in_flight=0, max_in_flight=0, lock=threading.Lock())
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            time.sleep(0.2)
+            with state.lock:
+                state.in_flight -= 1
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args: Any) -> None:  # noqa: ANN401
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SearchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f'http://127.0.0.1:{server.server_port}'
+    yield state
+    server.shutdown()
+    server.server_close()
+
+
+def test_aquery_shares_session_and_semaphore(monkeypatch: pytest.MonkeyPatch, search_server: SimpleNamespace) -> None:
+    sessions = []
+
+    def mock_geo_search(**kwargs: Any) -> list[SimpleNamespace]:  # noqa: ANN401
+        session = kwargs['opts'].session
+        sessions.append(session)
+        path = session.get(f'{search_server.url}/{kwargs["relativeOrbit"][0]}').text
+        return [SimpleNamespace(geojson=lambda: {'path': path})]
+
+    monkeypatch.setattr(s1_stack.asf, 'geo_search', mock_geo_search)
+    frames = [
+        SimpleNamespace(frame_id=k, hemisphere=None, track_numbers=[k], frame_geometry=box(0, 0, 1, 1))
+        for k in range(6)
+    ]
+    session = s1_stack.ASFSessionWithTimeout(timeout=5)
+
+    async def query_frames() -> list[list[dict]]:
+        semaphore = asyncio.Semaphore(2)
+        return await asyncio.gather(
+            *(aquery_slc_metadata_over_frame(frame, session=session, semaphore=semaphore) for frame in frames)
+        )
+
+    results = asyncio.run(query_frames())
+    assert results == [[{'path': f'/{k}'}] for k in range(6)]
+    assert all(s is session for s in sessions)
+    assert search_server.max_in_flight == 2
+
+
+def test_aget_s1_stack_matches_get_s1_stack(
+    monkeypatch: pytest.MonkeyPatch, asf_results_from_query_by_frame: Callable[[int], list[dict]]
+) -> None:
+    def mock_response(frame: S1Frame, **kwargs: dict) -> list[dict]:
+        return asf_results_from_query_by_frame(frame.frame_id)
+
+    monkeypatch.setattr(s1_stack, 'query_slc_metadata_over_frame', mock_response)
+    monkeypatch.setattr(s1_stack_async, 'query_slc_metadata_over_frame', mock_response)
+
+    frames = [S1Frame(9847), S1Frame(9848)]
+    df_stack = get_s1_stack(frames)
+    df_stack_async = asyncio.run(aget_s1_stack(frames, max_concurrent_queries=2))
+    assert df_stack_async.equals(df_stack)